@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic Yace-files and C Headers for benchmarking
+
+The content is deterministic, that is, the same arguments produce the same
+files, such that measurements are comparable across runs and changes. The
+interface consists of:
+
+* ``defines``   -- Macros with decimal, hexadecimal, and string values
+* ``enums``     -- Enumerations with four values each
+* ``structs``   -- Structs with fixed-width fields, where every struct, up to
+  the given ``depth``, has a field of the type of the struct before it
+* ``functions`` -- Functions taking two parameters, returning an integer
+
+Either give the counts of each, or a total number of ``entities`` which is then
+distributed among them.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import yaml
+
+TYPES = [
+    ("u8_tspec", "uint8_t"),
+    ("u16_tspec", "uint16_t"),
+    ("u32_tspec", "uint32_t"),
+    ("u64_tspec", "uint64_t"),
+    ("i32_tspec", "int32_t"),
+]
+
+META = {
+    "lic": "BSD-3-Clause",
+    "version": "0.0.1",
+    "author": "Bench Mark <bench@example.com>",
+    "project": "bench",
+    "prefix": "bench",
+    "brief": "Synthetic interface for benchmarking",
+    "full": "Synthetic interface for benchmarking",
+}
+
+
+def doc(brief: str) -> dict:
+    return {"brief": brief, "description": "", "tags": {}}
+
+
+def distribute(entities: int) -> dict:
+    """Returns counts of each kind of entity, summing to 'entities'"""
+
+    counts = {
+        "defines": entities * 4 // 10,
+        "enums": entities // 10,
+        "structs": entities * 4 // 10,
+    }
+    counts["functions"] = entities - sum(counts.values())
+
+    return counts
+
+
+def struct_fields(index: int, depth: int):
+    """Returns the fields of struct 'index' as (typespec-data, C type, name)"""
+
+    fields = [
+        (key, ctype, f"f{nr}")
+        for nr, (key, ctype) in enumerate(TYPES[: 2 + index % (len(TYPES) - 1)])
+    ]
+    if depth and index % depth:
+        name = f"bench_struct_{index - 1}"
+        record = {"key": "record_tspec", "sym": name, "struct": True}
+        record["canonical"] = f"struct {name}"
+        fields.append((record, f"struct {name}", "inner"))
+
+    return fields
+
+
+def generate_model(
+    defines: int = 0,
+    enums: int = 0,
+    structs: int = 0,
+    depth: int = 3,
+    functions: int = 0,
+) -> dict:
+    """Returns the data of a Yace-file, see the module docstring"""
+
+    entities = []
+    for index in range(defines):
+        if index % 3 == 0:
+            val = {"key": "dec", "lit": index}
+        elif index % 3 == 1:
+            val = {"key": "hex", "lit": index}
+        else:
+            val = {"key": "str", "lit": f"VAL{index}"}
+        entities.append(
+            {
+                "key": "define",
+                "sym": f"BENCH_DEFINE_{index}",
+                "val": val,
+                "doc": doc(""),
+            }
+        )
+
+    for index in range(enums):
+        entities.append(
+            {
+                "key": "enum",
+                "sym": f"bench_enum_{index}",
+                "doc": doc(f"Enumeration {index}"),
+                "members": [
+                    {
+                        "key": "enum_value",
+                        "sym": f"BENCH_ENUM_{index}_VAL_{nr}",
+                        "val": {"key": "dec", "lit": nr},
+                        "doc": doc(f"Value {nr}"),
+                    }
+                    for nr in range(4)
+                ],
+            }
+        )
+
+    for index in range(structs):
+        entities.append(
+            {
+                "key": "struct_decl",
+                "sym": f"bench_struct_{index}",
+                "doc": doc(f"Struct {index}"),
+                "members": [
+                    {"key": "field_decl", "sym": sym, "typ": typ, "doc": doc(sym)}
+                    for typ, _, sym in struct_fields(index, depth)
+                ],
+            }
+        )
+
+    for index in range(functions):
+        entities.append(
+            {
+                "key": "function_decl",
+                "sym": f"bench_function_{index}",
+                "doc": doc(f"Function {index}"),
+                "parameters": [
+                    {"key": "parameter_decl", "sym": "x", "typ": "i32_tspec"},
+                    {"key": "parameter_decl", "sym": "y", "typ": "u64_tspec"},
+                ],
+                "ret": "i32_tspec",
+            }
+        )
+
+    return {"meta": META, "entities": entities}
+
+
+def generate_header(
+    defines: int = 0,
+    enums: int = 0,
+    structs: int = 0,
+    depth: int = 3,
+    functions: int = 0,
+) -> str:
+    """Returns a C Header equivalent to the Yace-file of :func:`.generate_model`"""
+
+    lines = ["#include <stdint.h>", ""]
+    for index in range(defines):
+        if index % 3 == 0:
+            val = f"{index}"
+        elif index % 3 == 1:
+            val = f"{hex(index)}"
+        else:
+            val = f'"VAL{index}"'
+        lines.append(f"#define BENCH_DEFINE_{index} {val}")
+    lines.append("")
+
+    for index in range(enums):
+        lines += [f"/**\n * Enumeration {index}\n */", f"enum bench_enum_{index} {{"]
+        lines += [
+            f"  BENCH_ENUM_{index}_VAL_{nr} = {nr}, ///< Value {nr}" for nr in range(4)
+        ]
+        lines += ["};", ""]
+
+    for index in range(structs):
+        lines += [f"/**\n * Struct {index}\n */", f"struct bench_struct_{index} {{"]
+        lines += [
+            f"  {ctype} {sym}; ///< {sym}"
+            for _, ctype, sym in struct_fields(index, depth)
+        ]
+        lines += ["};", ""]
+
+    for index in range(functions):
+        lines += [
+            f"/**\n * Function {index}\n */",
+            f"int32_t bench_function_{index}(int32_t x, uint64_t y);",
+            "",
+        ]
+
+    return "\n".join(lines)
+
+
+def generate(output: Path, name: str, counts: dict):
+    """Write '{name}.yaml' and '{name}.h' to 'output', returns their paths"""
+
+    output.mkdir(parents=True, exist_ok=True)
+
+    yaml_path = output / f"{name}.yaml"
+    with yaml_path.open("w") as file:
+        yaml.dump(
+            generate_model(**counts),
+            file,
+            Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper),
+        )
+
+    header_path = output / f"{name}.h"
+    header_path.write_text(generate_header(**counts))
+
+    return yaml_path, header_path
+
+
+def parse_args():
+    """Parse command-line arguments"""
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--output", type=Path, default=Path.cwd(), help="output dir")
+    parser.add_argument("--name", default="bench", help="stem of the files written")
+    parser.add_argument(
+        "--entities", type=int, default=None, help="total number of entities"
+    )
+    for kind in ["defines", "enums", "structs", "functions"]:
+        parser.add_argument(f"--{kind}", type=int, default=0, help=f"number of {kind}")
+    parser.add_argument("--depth", type=int, default=3, help="nesting depth of structs")
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.entities is not None:
+        counts = distribute(args.entities)
+    else:
+        counts = {
+            k: getattr(args, k) for k in ["defines", "enums", "structs", "functions"]
+        }
+    counts["depth"] = args.depth
+
+    for path in generate(args.output, args.name, counts):
+        print(path)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
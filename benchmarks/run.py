@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Measure how the stages of **yace** scale with the size of the interface
+
+For each of the given sizes, a synthetic Yace-file and C Header, of that many
+entities, is generated, see ``generate.py``, and taken through the stages:
+
+* ``parse``      -- Loading the Yace-file
+* ``{target}.transform``, ``{target}.emit``, ``{target}.format`` -- for the
+  targets, formatting only when the tools of the target are available
+* ``c_to_yace``  -- Parsing the C Header into a Yace-file
+
+Wall-clock time, CPU time, and peak of memory, are recorded per stage, via
+:mod:`yace.trace`. Times are measured without tracing memory, as it slows
+everything down, and the peaks of memory are measured in a second pass. The
+results are compared against the stored baseline, by default
+``baseline.json`` next to this file. With '--save' the results are stored as
+the new baseline, do so on the machine that the results are compared on.
+Exits non-zero when a stage is slower than the baseline by more than the given
+'--threshold' factor.
+"""
+
+import argparse
+import copy
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from generate import distribute, generate
+
+from yace import trace
+from yace.model import Model
+from yace.targets import load
+
+BASELINE = Path(__file__).parent / "baseline.json"
+
+
+def parse_args():
+    """Parse command-line arguments"""
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=[1000, 10000],
+        help="number of entities of the interfaces to measure",
+    )
+    parser.add_argument(
+        "--targets", nargs="+", default=["capi", "ctypes"], help="targets to measure"
+    )
+    parser.add_argument("--depth", type=int, default=3, help="nesting depth of structs")
+    parser.add_argument(
+        "--no-c-to-yace", action="store_true", help="skip parsing the C Header"
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE, help="baseline")
+    parser.add_argument("--save", action="store_true", help="store as baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="fail when a stage takes more than this factor of the baseline",
+    )
+
+    return parser.parse_args()
+
+
+def measure(workdir: Path, size: int, args) -> dict:
+    """Returns the measurements, per stage, of an interface of 'size' entities"""
+
+    yaml_path, header_path = generate(
+        workdir, f"bench{size}", {**distribute(size), "depth": args.depth}
+    )
+
+    times = run_stages(yaml_path, header_path, workdir / f"times{size}", args, False)
+    peaks = run_stages(yaml_path, header_path, workdir / f"peaks{size}", args, True)
+
+    return {
+        stage: {
+            "wall_ms": result["wall_ms"],
+            "cpu_ms": result["cpu_ms"],
+            "mem_peak_kb": peaks[stage]["mem_peak_kb"],
+        }
+        for stage, result in times.items()
+    }
+
+
+def run_stages(
+    yaml_path: Path, header_path: Path, output: Path, args, memory: bool
+) -> dict:
+    """Returns the trace-event arguments of the stages, tracing 'memory' or not"""
+
+    tracer = trace.start(memory)
+    try:
+        with trace.span("parse", "bench"):
+            model = Model.from_path(yaml_path)
+
+        for cls in load(args.targets):
+            target = cls(output)
+            formatting = target.is_ready()
+
+            target_model = copy.deepcopy(model)
+            with trace.span(f"{cls.NAME}.transform", "bench"):
+                target_model = target.transform(target_model)
+            with trace.span(f"{cls.NAME}.emit", "bench"):
+                target.emit(target_model)
+                if not formatting:
+                    target.flush()
+            if formatting:
+                with trace.span(f"{cls.NAME}.format", "bench"):
+                    target.format()
+
+        if not args.no_c_to_yace:
+            from yace.ir.cparser import c_to_yace
+
+            with trace.span("c_to_yace", "bench"):
+                c_to_yace([header_path], output)
+    finally:
+        trace.stop()
+
+    return {
+        event["name"]: event["args"]
+        for event in tracer.events
+        if event["cat"] == "bench"
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Print 'results' next to 'baseline', returns the stages regressed"""
+
+    regressed = []
+
+    print(
+        f"{'size':>7} {'stage':<18} {'wall_ms':>10} {'base_ms':>10} {'ratio':>6}",
+        end="",
+    )
+    print(f" {'mem_peak_kb':>12}")
+    for size, stages in results.items():
+        for stage, result in stages.items():
+            base = baseline.get(size, {}).get(stage)
+            ratio = result["wall_ms"] / base["wall_ms"] if base else None
+            print(
+                f"{size:>7} {stage:<18} {result['wall_ms']:>10.1f}"
+                f" {base['wall_ms'] if base else float('nan'):>10.1f}"
+                f" {ratio if ratio else float('nan'):>6.2f}"
+                f" {result['mem_peak_kb']:>12.1f}"
+            )
+            if ratio and ratio > threshold:
+                regressed.append(f"{size}: {stage}")
+
+    return regressed
+
+
+def main():
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = {str(size): measure(Path(workdir), size, args) for size in args.sizes}
+
+    try:
+        baseline = json.loads(args.baseline.read_text())
+    except (OSError, ValueError):
+        baseline = {}
+
+    regressed = compare(results, baseline, args.threshold)
+
+    if args.save:
+        args.baseline.write_text(json.dumps({**baseline, **results}, indent=2) + "\n")
+        print(f"Stored baseline: {args.baseline}")
+        return 0
+
+    if regressed:
+        print(f"Regressed, by more than x{args.threshold}: {regressed}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
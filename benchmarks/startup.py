@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Measure the start-up time of the **yace** command-line interface
+
+The build invokes **yace** once per interface, that is, hundreds of times, thus
+time spent importing modules which are not needed for the given invocation adds
+up. This runs each of the commands below a number of times, and reports the
+median wall-clock time. With '--max', then it exits non-zero when the median of
+'yace --version' exceeds the given number of milliseconds.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+COMMANDS = {
+    "version": ["-m", "yace", "--version"],
+    "import-cli": ["-c", "import yace.cli.yace"],
+    "import-compiler": ["-c", "import yace.compiler"],
+    "import-cparser": ["-c", "import yace.ir.cparser"],
+}
+
+
+def parse_args():
+    """Parse command-line arguments"""
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--repeat", type=int, default=10, help="number of runs per command"
+    )
+    parser.add_argument(
+        "--max",
+        type=float,
+        default=None,
+        help="fail when the median of 'yace --version' exceeds this, in msec",
+    )
+
+    return parser.parse_args()
+
+
+def measure(args, repeat):
+    """Returns the median wall-clock time, in msec, of running 'args'"""
+
+    samples = []
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        subprocess.run([sys.executable] + args, check=True, capture_output=True)
+        samples.append((time.perf_counter() - begin) * 1000)
+
+    return statistics.median(samples)
+
+
+def main():
+    args = parse_args()
+
+    results = {name: measure(cmd, args.repeat) for name, cmd in COMMANDS.items()}
+    for name, msec in results.items():
+        print(f"{name:<16} {msec:8.1f} msec")
+
+    if args.max is not None and results["version"] > args.max:
+        print(f"FAILED: 'yace --version' took {results['version']:.1f} > {args.max}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
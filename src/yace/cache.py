@@ -0,0 +1,118 @@
+"""
+The build-cache enables incremental compilation, that is, skipping the
+target-specific stages when nothing affecting their output has changed since
+the last time they were run. For a given Yace-file and target, then the
+:class:`.BuildCache` computes a key by hashing:
+
+* The content of the Yace-file
+* The files in the directory of the target, e.g. its templates
+* The target class, the version of **yace**, and the stages to run
+* The versions of the tools used by the target
+
+The key, along with the paths to the artifacts produced, is stored in a stamp
+file, in the output directory of the target, when the target succeeds. On
+subsequent runs, then the target is up-to-date when the key matches and the
+artifacts exist.
+"""
+
+import hashlib
+import inspect
+import json
+import logging as log
+from pathlib import Path
+from typing import List
+
+import yace
+
+
+def digest_file(path: Path) -> str:
+    """Returns the sha256 hex-digest of the content of the file at 'path'"""
+
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def digest_dir(path: Path) -> str:
+    """Returns the sha256 hex-digest of names and content of files in 'path'"""
+
+    sha = hashlib.sha256()
+    for fpath in sorted(p for p in path.iterdir() if p.is_file()):
+        sha.update(fpath.name.encode())
+        sha.update(fpath.read_bytes())
+
+    return sha.hexdigest()
+
+
+class BuildCache(object):
+    """
+    Stamp of a successful run of the 'stages' of 'target' on the Yace-file at
+    'path'
+    """
+
+    DIRNAME = ".yace-cache"  # Name of the directory, in the target output, for stamps
+
+    def __init__(self, target, path: Path, stages: List[str]):
+        self.target = target
+        self.path = path.resolve()
+        self.stages = stages
+
+        name = hashlib.sha256(str(self.path).encode()).hexdigest()[:16]
+        self.stamp = target.output / BuildCache.DIRNAME / f"{path.stem}-{name}.json"
+        self.digest = None
+
+    def key(self) -> str:
+        """Returns the key of the inputs of the target, computed once"""
+
+        if self.digest is not None:
+            return self.digest
+
+        cls = type(self.target)
+
+        sha = hashlib.sha256()
+        for part in [
+            yace.__version__,
+            f"{cls.__module__}.{cls.__qualname__}",
+            digest_dir(Path(inspect.getfile(cls)).parent),
+            digest_file(self.path),
+            " ".join(self.stages),
+        ] + [
+            f"{label}: {tool.version()}"
+            for label, tool in sorted(self.target.tools.items())
+        ]:
+            sha.update(part.encode())
+            sha.update(b"\0")
+        self.digest = sha.hexdigest()
+
+        return self.digest
+
+    def is_up_to_date(self) -> bool:
+        """Returns True when the stamp matches the key and the artifacts exist"""
+
+        try:
+            stamp = json.loads(self.stamp.read_text())
+        except (OSError, ValueError):
+            return False
+
+        if stamp.get("key") != self.key():
+            return False
+
+        missing = [p for p in stamp.get("artifacts", []) if not Path(p).exists()]
+        if missing:
+            log.info("Missing artifacts: %s", missing)
+            return False
+
+        return True
+
+    def store(self):
+        """Write the stamp with the key, and the artifacts, of the target"""
+
+        artifacts = [
+            str(p) for p in self.target.headers + self.target.sources + self.target.aux
+        ]
+
+        self.stamp.parent.mkdir(parents=True, exist_ok=True)
+        self.stamp.write_text(json.dumps({"key": self.key(), "artifacts": artifacts}))
+
+    def clear(self):
+        """Remove the stamp, if any"""
+
+        self.stamp.unlink(missing_ok=True)
@@ -10,14 +10,14 @@ TODO
 * Discover targets via packages under the namespace 'yace.targets.{NAME}`
 
 """
+
 import argparse
 import logging as log
 import sys
 from pathlib import Path
 
 from yace import __version__ as version
-from yace.compiler import Compiler
-from yace.ir.cparser import c_to_yace
+from yace.targets import BUILTIN
 
 
 def parse_args():
@@ -35,9 +35,10 @@ def parse_args():
     parser.add_argument(
         "--emit",
         nargs="+",
-        choices=sorted([target.NAME for target in Compiler.TARGETS]),
-        default="capi",
-        help="treat filepath(s) as Yace-file, and emit code using target(s), then exit",
+        default=["capi"],
+        help="treat filepath(s) as Yace-file, and emit code using target(s), then "
+        f"exit; builtin targets: {', '.join(sorted(BUILTIN))}, or a target in the "
+        "current workdir",
     )
     parser.add_argument(
         "--version",
@@ -51,6 +52,44 @@ def parse_args():
         default=Path.cwd(),
         help="path to output directory, for emitted code / artifacts",
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="number of C Headers, Yace-files, or targets, to process concurrently",
+    )
+    parser.add_argument(
+        "--tool-jobs",
+        type=int,
+        default=None,
+        help="number of tool invocations, e.g. formatters and compilers, to run "
+        "concurrently, across all files and targets; defaults to number of CPUs",
+    )
+    parser.add_argument(
+        "--pch",
+        nargs="+",
+        default=[],
+        help="treat filepath(s) as C Header, and pre-compile the given header(s) "
+        "once, e.g. large headers included by all the C Headers",
+    )
+    parser.add_argument(
+        "--fast-parse",
+        action="store_true",
+        help="treat filepath(s) as C Header, and skip function bodies when parsing",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="process all targets, regardless of them being up-to-date",
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        default=None,
+        help="record time and memory of stages, renders, and tools; writing them "
+        "as Chrome trace-event JSON to the given file",
+    )
     parser.add_argument(
         "--log-level",
         "-l",
@@ -66,9 +105,24 @@ def parse_args():
 def main():
     """Emit enums, structs, and pretty-printer functions for them"""
 
-    ok = False
+    args = parse_args()
+    if args.trace is None:
+        return run(args)
+
+    from yace import trace
+
+    trace.start()
+    try:
+        with trace.span("yace", "cli", argv=sys.argv[1:]):
+            return run(args)
+    finally:
+        trace.stop(args.trace)
+
+
+def run(args):
+    """Process the C Headers or Yace-files given by the command-line 'args'"""
+
     try:
-        args = parse_args()
         args.filepath = [filepath.resolve() for filepath in args.filepath]
 
         levels = [log.ERROR, log.INFO, log.DEBUG]
@@ -92,7 +146,11 @@ def main():
         if suffixes[0] == ".h":  # C to Yace-file Compiler
             log.info("Got .h will convert to Yace IR")
 
-            entity_count, errors = c_to_yace(args.filepath, args.output)
+            from yace.ir.cparser import c_to_yace  # Only load libclang when needed
+
+            entity_count, errors = c_to_yace(
+                args.filepath, args.output, args.jobs, args.pch, args.fast_parse
+            )
             for error in errors:
                 log.warning(error)
 
@@ -109,9 +167,28 @@ def main():
             return sys.exit(0)
 
         log.info(f"Got .yaml, will do '{args.emit}'")
-        yace = Compiler(args.emit, args.output)
-        ok = all([yace.process(path, yace.STAGES) for path in args.filepath])
-        return sys.exit(0 if ok else 1)
+
+        from yace.compiler import Compiler  # Only load the model when needed
+        from yace.tools import Tool
+
+        if args.tool_jobs is not None:
+            Tool.set_concurrency(args.tool_jobs)
+
+        try:
+            yace = Compiler(args.emit, args.output, args.jobs, not args.no_cache)
+        except KeyError as exc:
+            log.error(exc.args[0])
+            return sys.exit(1)
+
+        results = yace.process_batch(args.filepath, yace.STAGES)
+        if len(results) > 1:
+            for path, result in results.items():
+                print(f"{'OK' if result else 'FAILED'}: {path}")
+        failed = [str(path) for path, result in results.items() if not result]
+        if failed:
+            log.error(f"Failed processing {len(failed)}/{len(results)}: {failed}")
+
+        return sys.exit(0 if not failed else 1)
 
     except Exception as exc:
         log.error("Unhandled Exception: message(%s)", exc)
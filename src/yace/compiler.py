@@ -1,12 +1,13 @@
 import copy
 import logging as log
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
+from yace import trace
+from yace.cache import BuildCache
 from yace.model import Model
-from yace.targets.capi.target import CAPI
-from yace.targets.collector import collect
-from yace.targets.ctypes.target import Ctypes
+from yace.targets import load
 
 
 class Compiler(object):
@@ -23,62 +24,203 @@ class Compiler(object):
     The first two stages are generic, the third is generic however is usually performed
     for target-specific-reasons such as re-structuring the IR to make the code-emitter
     simpler, the last three are target-specific.
+
+    The targets share no state once the model is parsed, thus, with ``jobs > 1``
+    then the target-specific stages of multiple targets are run concurrently, by
+    a pool of ``jobs`` workers. Since the work of the targets is mostly done by
+    the tools they invoke, then a pool of threads suffice.
+
+    Similarly, :meth:`.Compiler.process_batch` processes multiple Yace-files
+    concurrently, probing the availability of the tools used by the targets
+    only once, rather than for every file. The files share the output directory
+    of each target, thus, targets guard side-effects on shared files, e.g. its
+    style-definitions and documentation, see :func:`yace.targets.target.output_lock`.
+
+    Unless disabled, then the stages of a target are skipped when the target is
+    up-to-date according to the :class:`yace.cache.BuildCache`, and when all
+    targets are up-to-date, then the Yace-file is not even parsed.
     """
 
     STAGES = ["parse", "lint", "transform", "emit", "format", "check"]
-    TARGETS = list(set([CAPI, Ctypes] + collect()))
 
-    def __init__(self, targets: List[str], output: Path):
-        self.targets = [target for target in Compiler.TARGETS if target.NAME in targets]
+    def __init__(
+        self, targets: List[str], output: Path, jobs: int = 1, cache: bool = True
+    ):
+        self.targets = load(targets)
         self.output = output.resolve()
+        self.jobs = max(1, jobs)
+        self.cache = cache
+        self.ready: Dict[type, bool] = {}  # Result of Target.is_ready() per class
+
+    def is_ready(self, target) -> bool:
+        """Returns the result of 'target.is_ready()', probed once per target-class"""
+
+        cls = type(target)
+        if cls not in self.ready:
+            self.ready[cls] = target.is_ready()
+
+        return self.ready[cls]
+
+    def process_target(self, target, model: Model, stages: List[str]) -> bool:
+        """
+        Take 'model' through the target-specific 'stages' of the given 'target'.
+        The 'model' is owned by the target, that is, it is transformed in-place.
+        Returns False when a stage reports an error.
+        """
+
+        with trace.span(target.NAME, "target"):
+            return self.process_target_stages(target, model, stages)
+
+    def process_target_stages(self, target, model: Model, stages: List[str]) -> bool:
+        """Take 'model' through the 'stages' of 'target', see :meth:`.process_target`"""
+
+        log.info("Target: %s", target.NAME)
+
+        if "transform" in stages:
+            log.info("Target: %s, Stage: 'transform'", target.NAME)
+            with trace.span("transform", "stage", target=target.NAME):
+                model = target.transform(model)
+
+        if "emit" in stages:
+            log.info("Target: %s, Stage: 'emit'", target.NAME)
+            with trace.span("emit", "stage", target=target.NAME):
+                err = target.emit(model)
+                if not err and "format" not in stages:
+                    target.flush()
+            if err:
+                log.error("Target: %s, got error, stopping.", target.NAME)
+                return False
+
+        if "format" in stages:
+            log.info("Target: %s, Stage: 'format'", target.NAME)
+            with trace.span("format", "stage", target=target.NAME):
+                err = target.format()
+            if err:
+                log.error("Target: %s, got error, stopping.", target.NAME)
+                return False
+
+        if "check" in stages:
+            log.info("Target: %s, Stage: 'check'", target.NAME)
+            with trace.span("check", "stage", target=target.NAME):
+                err = target.check(model)
+            if err:
+                log.error("Target: %s, got error, stopping.", target.NAME)
+                return False
+
+        return True
 
-    def process(self, path: Path, stages: Optional[List[str]] = None) -> bool:
+    def process(
+        self, path: Path, stages: Optional[List[str]] = None, jobs: Optional[int] = None
+    ) -> bool:
         """
-        Take 'path' through the given compiler 'stages'
+        Take 'path' through the given compiler 'stages', processing up to 'jobs'
+        targets concurrently, defaulting to self.jobs
         """
 
+        if jobs is None:
+            jobs = self.jobs
+
         if stages is None:
             stages = Compiler.STAGES
 
+        with trace.span(path.name, "file", path=str(path)):
+            return self.process_stages(path, stages, jobs)
+
+    def process_stages(self, path: Path, stages: List[str], jobs: int) -> bool:
+        """Take 'path' through the given 'stages', see :meth:`.process`"""
+
         log.info("Path: '%s', stages: '%s'", path, stages)
         self.output.mkdir(parents=True, exist_ok=True)
 
-        log.info("Stage: 'parse'")
-        model_orig = Model.from_path(path)
-
         targets = [cls(self.output) for cls in self.targets]
-        if not all([tgt.is_ready() for tgt in targets]):
+        if not all([self.is_ready(tgt) for tgt in targets]):
             log.error("One or more targets !ready; see above/log. stopping.")
             return False
 
-        for target in targets:
-            log.info("Target: %s", target.NAME)
+        caches = {}
+        if self.cache:
+            caches = {tgt.NAME: BuildCache(tgt, path, stages) for tgt in targets}
+            for target in [tgt for tgt in targets if caches[tgt.NAME].is_up_to_date()]:
+                log.info("Target: %s, up to date", target.NAME)
+                targets.remove(target)
+            if not targets:
+                return True
 
-            model = copy.deepcopy(model_orig)
+            for target in targets:
+                caches[target.NAME].clear()
 
-            if "transform" in stages:
-                log.info("Stage: 'transform'")
-                model = target.transform(model)
+        log.info("Stage: 'parse'")
+        with trace.span("parse", "stage", path=str(path)):
+            if self.cache:
+                model_orig = Model.from_path_cached(
+                    path, self.output / BuildCache.DIRNAME
+                )
+            else:
+                model_orig = Model.from_path(path)
+
+        # Each target transforms its model in-place, thus, all but the last
+        # target is given a copy, and the last is given the original. When run
+        # one after the other, then the copy is made as the target is run, such
+        # that at most one copy is alive at a time
+        if jobs == 1 or len(targets) == 1:
+            for nr, target in enumerate(targets):
+                last = nr == len(targets) - 1
+                model = model_orig if last else copy.deepcopy(model_orig)
+                result = self.process_target(target, model, stages)
+                del model  # Release the copy before making the next
+                if not result:
+                    return False
+                if target.NAME in caches:
+                    caches[target.NAME].store()
+
+            return True
+
+        models = [copy.deepcopy(model_orig) for _ in targets[1:]] + [model_orig]
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            results = list(
+                pool.map(
+                    lambda tgt, model: self.process_target(tgt, model, stages),
+                    targets,
+                    models,
+                )
+            )
+
+        for target, result in zip(targets, results):
+            log.info("Target: %s, %s", target.NAME, "OK" if result else "FAILED")
+            if result and target.NAME in caches:
+                caches[target.NAME].store()
+
+        return all(results)
+
+    def process_batch(
+        self, paths: List[Path], stages: Optional[List[str]] = None
+    ) -> Dict[Path, bool]:
+        """
+        Take each of the given 'paths' through the given compiler 'stages',
+        processing up to self.jobs files concurrently. The availability of the
+        tools is probed once, up front, and shared by all files. An exception
+        raised while processing one file fails that file, not the batch.
 
-            if "emit" in stages:
-                log.info("Stage: 'emit'")
-                err = target.emit(model)
-                if err:
-                    log.error("Got error, stopping.")
-                    break
+        Returns a dict mapping each path to the result of :meth:`.process`.
+        """
 
-            if "format" in stages:
-                log.info("Stage: 'format'")
-                err = target.format()
-                if err:
-                    log.error("Got error, stopping.")
-                    break
+        targets = [cls(self.output) for cls in self.targets]
+        if not all([self.is_ready(tgt) for tgt in targets]):
+            log.error("One or more targets !ready; see above/log. stopping.")
+            return {path: False for path in paths}
 
-            if "check" in stages:
-                log.info("Stage: 'check'")
-                err = target.check(model)
-                if err:
-                    log.error("Got error, stopping.")
-                    break
+        if len(paths) == 1:
+            return {paths[0]: self.process(paths[0], stages)}
 
-        return True
+        def process_guarded(path):
+            try:
+                return self.process(path, stages, 1)
+            except Exception as exc:
+                log.error("Path: '%s', exception(%s)", path, exc, exc_info=True)
+
+            return False
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            results = list(pool.map(process_guarded, paths))
+
+        return dict(zip(paths, results))
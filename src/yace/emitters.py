@@ -2,9 +2,13 @@
 YAML ==> Interface(List[Entities]) ==> Emitter() ==> CodeTarget
 """
 
+import os
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, pass_context
+
+from yace import trace
 
 
 def camelcase(symbol, pascalcase=True):
@@ -19,6 +23,22 @@ def camelcase(symbol, pascalcase=True):
     return camelized[0].lower() + camelized[1:]
 
 
+@pass_context
+def emit_entity(context, entity, depth: int = 0):
+    """
+    Render the given 'entity' using the template named "entity_{entity.key}.h",
+    with the arguments given to the template currently being rendered
+    """
+
+    args = dict(context.parent)
+    args["entity"] = entity
+    args["depth"] = depth
+
+    return context.environment.get_template(f"entity_{entity.key}.h.template").render(
+        **args
+    )
+
+
 class Emitter(object):
     """
     The default approach to transforming :class:`.Entity` in :class:`.Model`:
@@ -47,53 +67,65 @@ class Emitter(object):
         Entity ==> SourceCodeText
 
     Is by default handled in one place: the Jinja templates.
+
+    The Jinja environments are cached per searchpath, see
+    :meth:`.Emitter.environment`, thus, templates are compiled once per process
+    rather than once per call to :meth:`.Emitter.render`.
     """
 
-    def __init__(self, searchpath: Path):
-        self.searchpath = searchpath.resolve()
+    ENVIRONMENTS: Dict[Tuple, Environment] = {}  # Cache of jinja-environments
 
-    def render(self, template, args, filters):
-        """Renders the given template, passing args..."""
+    def __init__(self, searchpath: Path, cachedir: Optional[Path] = None):
+        self.searchpath = searchpath.resolve()
 
-        # Emitter jinja-environment, setup here such that the filter-function
-        # 'emit_entity' can be utilized in the other jinja-environment
-        entity_jenv = Environment(
+        if cachedir is None and os.environ.get("YACE_TEMPLATE_CACHE"):
+            cachedir = Path(os.environ["YACE_TEMPLATE_CACHE"])
+        self.cachedir = cachedir.resolve() if cachedir else None
+
+    def environment(self, filters) -> Environment:
+        """
+        Returns the jinja-environment for self.searchpath and the given 'filters'
+
+        The environment, and thereby the templates compiled by it, are kept in
+        :attr:`.Emitter.ENVIRONMENTS` for the lifetime of the process. Thus,
+        templates are loaded and compiled once, regardless of the number of
+        :class:`.Emitter` instances and calls to :meth:`.Emitter.render`. When
+        a 'cachedir' is given, or the environment-variable
+        ``YACE_TEMPLATE_CACHE`` is set, then the compiled templates are
+        additionally stored on disk, via the jinja bytecode-cache, such that
+        they are re-used across processes.
+        """
+
+        key = (self.searchpath, self.cachedir, tuple(sorted(filters.items())))
+        jenv = Emitter.ENVIRONMENTS.get(key)
+        if jenv is not None:
+            return jenv
+
+        bcc = None
+        if self.cachedir:
+            self.cachedir.mkdir(parents=True, exist_ok=True)
+            bcc = FileSystemBytecodeCache(str(self.cachedir))
+
+        jenv = Environment(
             loader=FileSystemLoader(self.searchpath),
             extensions=["jinja2.ext.do"],
+            bytecode_cache=bcc,
+            auto_reload=False,
         )
-        entity_jenv.globals.update(zip=zip, len=len)
-        entity_jenv.filters["camelcase"] = camelcase
+        jenv.globals.update(zip=zip, len=len)
+        jenv.filters["camelcase"] = camelcase
+        jenv.filters["emit_entity"] = emit_entity
         for name, filter in filters.items():
-            entity_jenv.filters[name] = filter
+            jenv.filters[name] = filter
 
-        entity_templates = {
-            Path(f).stem: entity_jenv.get_template(f)
-            for f in entity_jenv.list_templates()
-            if f.endswith(".template") and f.startswith("entity_")
-        }
+        Emitter.ENVIRONMENTS[key] = jenv
 
-        def emit_entity(entity, depth: int = 0):
-            args["entity"] = entity
-            args["depth"] = depth
+        return jenv
 
-            return entity_templates[f"entity_{entity.key}.h"].render(**args)
-
-        # This is the jinja environment for files, e.g. the one that renders
-        # "file_<thing>.jinja"
-        file_jenv = Environment(
-            loader=FileSystemLoader(self.searchpath),
-            extensions=["jinja2.ext.do"],
-        )
-        file_jenv.globals.update(zip=zip, len=len)
-        file_jenv.filters["camelcase"] = camelcase
-        file_jenv.filters["emit_entity"] = emit_entity
-        for name, filter in filters.items():
-            file_jenv.filters[name] = filter
+    def render(self, template, args, filters):
+        """Renders the given template, passing args..."""
 
-        file_templates = {
-            Path(f).stem: file_jenv.get_template(f)
-            for f in file_jenv.list_templates()
-            if f.endswith(".template") and not f.startswith("entity_")
-        }
+        jenv = self.environment(filters)
 
-        return file_templates[template].render(**args)
+        with trace.span(template, "render"):
+            return jenv.get_template(f"{template}.template").render(**args)
@@ -10,9 +10,13 @@ The above are defined below.
 """
 
 import re
-from typing import Dict, Optional
+from typing import Annotated, Any, Dict, List, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, BeforeValidator, Discriminator, Field, Tag
+
+RE_DOC_MARKERS = re.compile(r"\/\*\*|\*\/")  # Comment markers: /** and */
+RE_DOC_TAG = re.compile(r"@(\w+)\s+(\w+)?\s*(.*?)\n\s*\*", re.DOTALL)
+RE_SYM = re.compile(r"[_a-z][_a-z0-9]{0,30}")
 
 
 class Docstring(BaseModel):
@@ -28,46 +32,51 @@ class Docstring(BaseModel):
 
     @classmethod
     def from_cursor(cls, cursor):
+        """Returns the docstring-data of the raw comment of the given 'cursor'"""
+
+        return cls.from_raw_comment(cursor.raw_comment)
+
+    @classmethod
+    def from_raw_comment(cls, raw_comment: Optional[str]):
+        """
+        Returns the docstring-data of the given 'raw_comment', the text is
+        scanned once, line by line, for the brief and the description, the tags
+        are matched on the raw comment
+        """
+
         data = {"brief": "", "description": "", "tags": {}}
 
-        raw_comment = ""
-        if cursor.raw_comment:
-            raw_comment = ("".join(list(cursor.raw_comment))).strip()
+        raw_comment = raw_comment.strip() if raw_comment else ""
 
         if raw_comment.startswith("///<"):
             data["brief"] = raw_comment[4:].strip()
             return cls(**data)
 
-        # Remove comment markers (/**, */, and leading *)
-        cleaned_docstring = re.sub(r"\/\*\*|\*\/", "", raw_comment)
-        cleaned_docstring = re.sub(
-            r"^\s*\*\s?", "", cleaned_docstring, flags=re.MULTILINE
-        ).strip()
-
-        # Split into lines
-        lines = cleaned_docstring.split("\n")
-
-        # Extract brief description (first non-empty line)
-        brief_description = lines[0].strip()
-        data["brief"] = brief_description
-
-        # Extract full description (everything after the first line,
-        # before any tag like @param/@return
+        # Remove comment markers (/**, */), then scan the lines, without the
+        # leading '*', for the brief (first non-empty line) and the description
+        # (everything after the brief, before any tag like @param/@return)
+        brief = None
         description_lines = []
-        for line in lines[1:]:
-            if line.strip().startswith("@"):
+        for line in RE_DOC_MARKERS.sub("", raw_comment).split("\n"):
+            stripped = line.lstrip()
+            if stripped.startswith("*"):
+                line = stripped[2:] if stripped[1:2].isspace() else stripped[1:]
+            line = line.strip()
+
+            if brief is None:
+                if line:
+                    brief = line
+                continue
+            if line.startswith("@"):
                 break
-            if line.strip():
-                description_lines.append(line.strip())
+            if line:
+                description_lines.append(line)
 
+        data["brief"] = brief or ""
         data["description"] = " ".join(description_lines)
 
-        # Generic tag pattern to match any tag starting with @
-        tag_pattern = re.compile(r"@(\w+)\s+(\w+)?\s*(.*?)\n\s*\*", re.DOTALL)
-        matches = re.findall(tag_pattern, raw_comment)
-
         tags = {}
-        for tag, param, desc in matches:
+        for tag, param, desc in RE_DOC_TAG.findall(raw_comment):
             if tag not in tags:
                 tags[tag] = {}
             if param:
@@ -114,8 +123,50 @@ class Named(BaseModel):
         if self.sym is None:
             return False, f"Invalid attr: sym == None; for {self.as_dict()}"
 
-        match = re.match(r"[_a-z][_a-z0-9]{0,30}", str(self.sym))
+        match = RE_SYM.match(str(self.sym))
         if match:
             return True, "OK"
 
         return False, f"Invalid attr: '{self.sym}'; for {self.as_dict()}"
+
+
+def entity_key(data: Any) -> Optional[str]:
+    """Returns the 'key' of the given entity or entity-data, if any"""
+
+    if isinstance(data, dict):
+        return data.get("key")
+
+    return getattr(data, "key", None)
+
+
+def expand_shorthand(data: Any) -> Any:
+    """
+    Expands the short-hands of entity-data:
+
+    - Integer literals: ``42`` instead of ``{key: dec, lit: 42}``
+    - Entities without attributes, e.g. data types: ``u16_tspec`` instead of
+      ``{key: u16_tspec}``
+    """
+
+    if type(data) is int:
+        return {"key": "dec", "lit": data}
+    elif isinstance(data, str):
+        return {"key": data}
+
+    return data
+
+
+def tagged_union(classes: List[type], shorthand: bool = False):
+    """
+    Returns a union of the given entity 'classes' discriminated by their 'key',
+    such that pydantic validates entity-data directly as the class matching the
+    key, rather than trying each class of the union. With 'shorthand', then
+    entity-data is expanded by :func:`.expand_shorthand` before validation.
+    """
+
+    tagged = [Annotated[cls, Tag(cls.model_fields["key"].default)] for cls in classes]
+    union = Annotated[Union[tuple(tagged)], Discriminator(entity_key)]
+    if shorthand:
+        return Annotated[union, BeforeValidator(expand_shorthand)]
+
+    return union
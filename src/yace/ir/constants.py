@@ -19,9 +19,9 @@ The **yace** constants consists of:
 
 Their ir representation follows below.
 """
-from typing import List, Union
+from typing import List
 
-from .base import Documented, Entity, Named
+from .base import Documented, Entity, Named, tagged_union
 
 
 class String(Entity):
@@ -75,7 +75,7 @@ class Define(Entity, Named):
     """
 
     key: str = "define"
-    val: Union[String, Hex, Dec]
+    val: tagged_union([String, Hex, Dec], shorthand=True)
 
 
 class EnumValue(Entity, Named, Documented):
@@ -90,7 +90,7 @@ class EnumValue(Entity, Named, Documented):
     """
 
     key: str = "enum_value"
-    val: Union[Hex, Dec]
+    val: tagged_union([Hex, Dec], shorthand=True)
 
 
 class Enum(Entity, Named, Documented):
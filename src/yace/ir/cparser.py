@@ -8,24 +8,59 @@ In this specific instance, to parse C Headers, and emit equivalent
 * :class:`.CParser`, parse a C header and emit a **Yace**-file
 """
 
+import ctypes
 import logging as log
 import os
 import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import clang
-from clang.cindex import Config, CursorKind, Index, TypeKind
+import yaml
+from clang.cindex import (
+    Config,
+    CursorKind,
+    Index,
+    SourceLocation,
+    TranslationUnit,
+    TypeKind,
+    conf,
+)
 from pydantic import ValidationError
 
 import yace
 from yace.errors import Error, ParseError, UnsupportedDatatype
 from yace.ir import constants, datatypes, directives
 from yace.ir.base import Docstring
-from yace.model import Model
+from yace.model import Dumper
+from yace.targets.target import temporary_path
 
 REGEX_INTEGER_FIXEDWIDTH = "(?P<unsigned>u)?int(?P<width>8|16|32|64|128)_t"
 
+RE_INTEGER_FIXEDWIDTH = re.compile(f"^{REGEX_INTEGER_FIXEDWIDTH}$")
+
+RE_LITERAL = re.compile(
+    r"(?P<hex>0x[0-9a-fA-F]+)|"  # Hexi-decimal
+    r"(?P<int>\d+)|"  # Plain integers
+    r"(?:\"(?P<str>[\s\wa-zA-Z0-9]+)\")"  # String constants
+)
+
+# Map of the groups of RE_LITERAL to the constant and the transform of its text
+LITERAL_TO_CONSTANT = {
+    "hex": (constants.Hex, lambda x: int(x, 16)),
+    "int": (constants.Dec, lambda x: int(x, 10)),
+    "str": (constants.String, str),
+}
+
+# Map of fixed-width integer spelling, e.g. 'uint8_t', to datatype shorthand
+FIXEDWIDTH_TO_SHORTHAND = {
+    f"{sign}int{width}_t": f"{sign if sign else 'i'}{width}_tspec"
+    for sign in ["", "u"]
+    for width in [8, 16, 32, 64, 128]
+}
+
 SHORTHAND_DATA = datatypes.classes_shorthand_data()
 
 SHORTHAND_TO_CLS = datatypes.get_shorthand_to_cls()
@@ -33,10 +68,42 @@ SHORTHAND_TO_CLS = datatypes.get_shorthand_to_cls()
 QUALIFIERS = [("volatile", False), ("restrict", False), ("const", True)]
 
 
+IS_FROM_MAIN_FILE = None  # See libclang_is_from_main_file()
+
+
+def libclang_is_from_main_file():
+    """
+    Returns the libclang function 'clang_Location_isFromMainFile', with its
+    prototype registered on first use. This is done lazily, rather than on
+    import, as libclang is loaded on first use, after :class:`.CParser` has set
+    the library-path.
+    """
+
+    global IS_FROM_MAIN_FILE
+
+    if IS_FROM_MAIN_FILE is None:
+        func = conf.lib.clang_Location_isFromMainFile
+        func.argtypes = [SourceLocation]
+        func.restype = ctypes.c_int
+        IS_FROM_MAIN_FILE = func
+
+    return IS_FROM_MAIN_FILE
+
+
+def is_from_main_file(cursor: clang.cindex.Cursor) -> bool:
+    """
+    Returns True when the given 'cursor' is located in the main-file of its
+    translation-unit. This is a single call into libclang, which is a lot cheaper
+    than retrieving, and comparing, the filename of the cursor location.
+    """
+
+    return bool(libclang_is_from_main_file()(cursor.location))
+
+
 def typedef_is_fixed_width_integer(text):
     """Returns true when the given typedef-spelling is a fixed-width integer typedef"""
 
-    return re.match(f"^{REGEX_INTEGER_FIXEDWIDTH}$", text) is not None
+    return RE_INTEGER_FIXEDWIDTH.match(text) is not None
 
 
 def get_fixed_width(tokens):
@@ -45,16 +112,13 @@ def get_fixed_width(tokens):
     if len(tokens) < 2:
         return None
 
-    match = re.match(REGEX_INTEGER_FIXEDWIDTH, tokens[-2])
-    if not match:
+    shorthand = FIXEDWIDTH_TO_SHORTHAND.get(tokens[-2])
+    if not shorthand:
         return None
 
     if len(tokens) > 2:
         assert tokens[0] == "const", tokens[0]
 
-    unsigned = match.group("unsigned") == "u"
-    width = int(match.group("width"))
-    shorthand = "".join(["u" if unsigned else "i", str(width), "_tspec"])
     inst = SHORTHAND_TO_CLS.get(shorthand)()
 
     assert inst.c_spelling() == " ".join(tokens[:-1])
@@ -63,13 +127,25 @@ def get_fixed_width(tokens):
 
 
 def typekind_to_typespec(
-    tobj: clang.cindex.Type, cursor: clang.cindex.Cursor
+    tobj: clang.cindex.Type,
+    cursor: clang.cindex.Cursor,
+    tokens: Optional[List[str]] = None,
 ) -> Tuple[Optional[datatypes.Typespec], Error]:
+    """
+    Returns a Typespec for the given type-object 'tobj' of 'cursor', the
+    spelling of the tokens of the cursor can be given via 'tokens', to avoid
+    retrieving them from libclang, otherwise they are retrieved once and passed
+    on when recursing into pointee / array-element types.
+    """
+
     canonical = tobj.get_canonical().spelling
     const = tobj.is_const_qualified()
 
+    if tokens is None:
+        tokens = [tok.spelling for tok in cursor.get_tokens()]
+
     # Handle fixed-width integers
-    fw_typ = get_fixed_width([tok.spelling for tok in cursor.get_tokens()])
+    fw_typ = get_fixed_width(tokens)
     if fw_typ:
         fw_typ.canonical = fw_typ.c_spelling()
         fw_typ.const = const
@@ -164,7 +240,7 @@ def typekind_to_typespec(
                 return datatypes.CString(), None
 
             # General case pointer to anything, everything, or nothing ;)
-            typespec, error = typekind_to_typespec(pointee, cursor)
+            typespec, error = typekind_to_typespec(pointee, cursor, tokens)
             if error:
                 return None, error
 
@@ -187,7 +263,7 @@ def typekind_to_typespec(
 
         case TypeKind.CONSTANTARRAY:
             array_typ, error = typekind_to_typespec(
-                cursor.type.get_array_element_type(), cursor
+                cursor.type.get_array_element_type(), cursor, tokens
             )
             if error:
                 return None, error
@@ -222,25 +298,13 @@ def literal_from_text(
     Will return the correct instance
     """
 
-    regex = (
-        r"(?P<hex>0x[0-9a-fA-F]+)|"  # Hexi-decimal
-        r"(?P<int>\d+)|"  # Plain integers
-        r"(?:\"(?P<str>[\s\wa-zA-Z0-9]+)\")"  # String constants
-    )
-
-    mapping = {
-        "hex": (constants.Hex, lambda x: int(x, 16)),
-        "int": (constants.Dec, lambda x: int(x, 10)),
-        "str": (constants.String, str),
-    }
-
-    match = re.match(regex, text)
+    match = RE_LITERAL.match(text)
     if not match:
         return None
 
     for key, val in match.groupdict().items():
         if val:
-            cls, transform = mapping[key]
+            cls, transform = LITERAL_TO_CONSTANT[key]
             return cls(lit=transform(val))
 
     return None
@@ -251,8 +315,20 @@ class CParser(object):
     Primitive wrapper around libclang Python bindings
     """
 
-    def __init__(self):
-        """Figure out a way to setup the index..."""
+    def __init__(
+        self,
+        args: Optional[List[str]] = None,
+        fast: bool = False,
+    ):
+        """
+        Figure out a way to setup the index...
+
+        The given 'args' are passed on to libclang when parsing, e.g. include
+        search-paths, and the pre-compiled header of :meth:`.CParser.create_pch`.
+        With 'fast', then libclang skips the bodies of functions, e.g. static
+        inline functions, and the semantic checks done at the end of a complete
+        translation-unit; neither are needed to produce a **Yace**-file.
+        """
 
         searchpath = os.environ.get("YACE_SEARCHPATH_LIBCLANG")
         if not searchpath:
@@ -264,21 +340,99 @@ class CParser(object):
             Config().set_library_path(searchpath)
 
         self.index = Index.create()
+        self.args = list(args) if args else []
+
+        self.options = TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD
+        self.fast = fast
+        if fast:
+            self.options |= TranslationUnit.PARSE_SKIP_FUNCTION_BODIES
+            self.options |= TranslationUnit.PARSE_INCOMPLETE
+        self.token_cache: Dict[int, List[Tuple[clang.cindex.Cursor, List[str]]]] = {}
+        self.comment_cache: Dict[int, List[Tuple[clang.cindex.Cursor, Any]]] = {}
+
+    def create_pch(self, headers: List[str], path: Path) -> Path:
+        """
+        Precompile the given 'headers' into a pre-compiled header (PCH) at
+        'path', and use it when parsing subsequent headers. This is useful when
+        the headers to parse all include the same, large, headers, as these are
+        then parsed once, instead of once per header.
+
+        Headers which exist on the file-system are included by their path,
+        others as system-headers, e.g. 'stdio.h' is included as <stdio.h>.
+        """
+
+        lines = []
+        for header in headers:
+            if Path(header).exists():
+                lines.append(f'#include "{Path(header).resolve()}"')
+            else:
+                lines.append(f"#include <{header}>")
+
+        prefix = path.with_suffix(".h")
+        prefix.write_text("\n".join(lines) + "\n")
+
+        tu = self.index.parse(
+            str(prefix),
+            args=["-x", "c-header"] + self.args,
+            options=TranslationUnit.PARSE_INCOMPLETE,
+        )
+        tu.save(str(path))
+
+        self.args += ["-include-pch", str(path)]
+
+        return path
 
     def parse_file(self, path: Path):
         """Parse the given file into a :class:`clang.cindex.TranslationUnit`."""
 
-        return self.index.parse(
-            str(path),
-            options=clang.cindex.TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD,
+        return self.index.parse(str(path), args=self.args, options=self.options)
+
+    def cached(self, cache: dict, cursor: clang.cindex.Cursor, compute):
+        """
+        Returns the value of 'compute(cursor)' from the given 'cache', computing
+        it on the first lookup of the given 'cursor'. Cursors are hashed by
+        libclang, and compared on lookup, as cursors of different entities can
+        share a hash.
+        """
+
+        bucket = cache.setdefault(cursor.hash, [])
+        for other, value in bucket:
+            if other == cursor:
+                return value
+
+        value = compute(cursor)
+        bucket.append((cursor, value))
+
+        return value
+
+    def tokens(self, cursor: clang.cindex.Cursor) -> List[str]:
+        """
+        Returns the spelling of the tokens of the given 'cursor'. The spelling is
+        retrieved from libclang once per cursor, and cached for the lifetime of
+        the translation-unit being transformed by :meth:`.CParser.tu_to_data`.
+        """
+
+        return self.cached(
+            self.token_cache,
+            cursor,
+            lambda cursor: [tok.spelling for tok in cursor.get_tokens()],
         )
 
+    def docstring(self, cursor: clang.cindex.Cursor):
+        """
+        Returns the :class:`.Docstring` data of the given 'cursor'. The raw
+        comment is retrieved from libclang, and parsed, once per cursor, cached
+        like :meth:`.CParser.tokens`.
+        """
+
+        return self.cached(self.comment_cache, cursor, Docstring.from_cursor)
+
     def parse_macro(
         self, cursor
     ) -> Tuple[Optional[yace.model.base.Entity], Optional[yace.errors.Error]]:
         """TODO: hex + int"""
 
-        tokens = [tok.spelling for tok in cursor.get_tokens()]
+        tokens = self.tokens(cursor)
         log.debug(f"({cursor.spelling}), tokens({tokens})")
 
         if len(tokens) == 1:
@@ -293,7 +447,7 @@ class CParser(object):
             )
             return None, error
 
-        sym, lit, *excess = list([tok.spelling for tok in cursor.get_tokens()])
+        sym, lit, *excess = tokens
         if excess:
             return None, ParseError.from_cursor(
                 message=f"sym({sym}), lit({lit}); Unexpected ntokens({len(excess)})",
@@ -332,7 +486,7 @@ class CParser(object):
                 members.append(
                     constants.EnumValue(
                         sym=child.spelling,
-                        doc=Docstring.from_cursor(child),
+                        doc=self.docstring(child),
                         val=constants.Dec(lit=child.enum_value),
                     )
                 )
@@ -343,7 +497,7 @@ class CParser(object):
             return (
                 constants.Enum(
                     sym=cursor.spelling,
-                    doc=Docstring.from_cursor(cursor),
+                    doc=self.docstring(cursor),
                     members=members,
                 ),
                 None,
@@ -361,7 +515,7 @@ class CParser(object):
 
             record = cls(
                 sym=cursor.spelling,
-                doc=Docstring.from_cursor(cursor),
+                doc=self.docstring(cursor),
                 members=[],
             )
         except ValidationError as exc:
@@ -384,21 +538,21 @@ class CParser(object):
                         f"expected FIELD_DECL; got: {field.kind}", cursor=field
                     )
 
-            ftyp, error = typekind_to_typespec(field.type, field)
+            ftyp, error = typekind_to_typespec(field.type, field, self.tokens(field))
             if error:
                 return None, error
 
             if field.is_bitfield():
                 field = yace.model.derivedtypes.Bitfield(
                     sym=field.spelling,
-                    doc=Docstring.from_cursor(field),
+                    doc=self.docstring(field),
                     nbits=field.get_bitfield_width(),
                     typ=ftyp,
                 )
             else:
                 field = yace.model.derivedtypes.Field(
                     sym=field.spelling,
-                    doc=Docstring.from_cursor(field),
+                    doc=self.docstring(field),
                     typ=ftyp,
                 )
 
@@ -413,7 +567,7 @@ class CParser(object):
 
         try:
             return yace.model.derivedtypes.Union(
-                sym=cursor.spelling, doc=Docstring.from_cursor(cursor)
+                sym=cursor.spelling, doc=self.docstring(cursor)
             )
         except ValidationError as exc:
             return None, ParseError.from_exception(exc, cursor)
@@ -439,7 +593,7 @@ class CParser(object):
                 log.warning(f"Skipping: {child} not PARM_DECL")
                 continue
 
-            ptyp, error = typekind_to_typespec(child.type, child)
+            ptyp, error = typekind_to_typespec(child.type, child, self.tokens(child))
             if error:
                 return None, error
 
@@ -447,19 +601,21 @@ class CParser(object):
                 yace.model.functiontypes.Parameter(
                     typ=ptyp,
                     sym=child.spelling,
-                    doc=Docstring.from_cursor(child),
+                    doc=self.docstring(child),
                 )
             )
 
         try:
-            rtyp, error = typekind_to_typespec(pointee.get_result(), cursor)
+            rtyp, error = typekind_to_typespec(
+                pointee.get_result(), cursor, self.tokens(cursor)
+            )
             if error:
                 return None, error
 
             return (
                 yace.model.functiontypes.FunctionPointer(
                     sym=cursor.spelling,
-                    doc=Docstring.from_cursor(cursor),
+                    doc=self.docstring(cursor),
                     ret=rtyp,
                     parameters=parameters,
                 ),
@@ -483,7 +639,7 @@ class CParser(object):
                     cursor,
                 )
 
-            ptyp, error = typekind_to_typespec(child.type, child)
+            ptyp, error = typekind_to_typespec(child.type, child, self.tokens(child))
             if error:
                 return None, error
 
@@ -491,19 +647,21 @@ class CParser(object):
                 yace.model.functiontypes.Parameter(
                     typ=ptyp,
                     sym=child.spelling,
-                    doc=Docstring.from_cursor(child),
+                    doc=self.docstring(child),
                 )
             )
 
         try:
-            rtyp, error = typekind_to_typespec(cursor.result_type, cursor)
+            rtyp, error = typekind_to_typespec(
+                cursor.result_type, cursor, self.tokens(cursor)
+            )
             if error:
                 return None, error
 
             return (
                 yace.model.functiontypes.Function(
                     sym=cursor.spelling,
-                    doc=Docstring.from_cursor(cursor),
+                    doc=self.docstring(cursor),
                     ret=rtyp,
                     parameters=parameters,
                 ),
@@ -513,20 +671,20 @@ class CParser(object):
         except ValidationError as exc:
             return None, ParseError.from_exception(exc, cursor)
 
-    def tu_to_data(self, tu, path: Path) -> Tuple[List[Any], List[Error]]:
-        """Transform the given translation-unit (tu) to data"""
+    def tu_to_entities(
+        self, tu, path: Path, errors: List[Error]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Transform the given translation-unit (tu) to entity-data, yielding the
+        data of each entity as soon as its cursor is converted, and appending
+        errors to the given list of 'errors'
+        """
 
-        errors: List[Error] = []
-        path.resolve()
+        self.token_cache = {}
+        self.comment_cache = {}
 
-        entities = []
         for cursor in tu.cursor.get_children():
-            if not cursor.location.file:
-                log.debug("Ignored definition which is not from the file")
-                continue
-
-            if Path(cursor.location.file.name).name != path.name:
-                log.debug(f"Skipped {cursor.location.file.name} != {path.name}")
+            if not is_from_main_file(cursor):  # Skip e.g. cursors of included files
                 continue
 
             match cursor.kind:
@@ -556,16 +714,135 @@ class CParser(object):
                 log.debug("No entity and no error for current cursor")
                 continue
 
-            entities.append(entity.model_dump())
+            yield entity.model_dump(exclude_none=True)
+
+        self.token_cache = {}
+        self.comment_cache = {}
+
+    def tu_to_data(self, tu, path: Path) -> Tuple[List[Any], List[Error]]:
+        """Transform the given translation-unit (tu) to data"""
+
+        errors: List[Error] = []
+        entities = list(self.tu_to_entities(tu, path, errors))
 
         return entities, errors
 
 
-def c_to_yace(paths: List[Path], output: Path) -> Tuple[int, List[Error]]:
+WORKER_PARSER: Optional[CParser] = None  # The parser of a c_to_yace() worker-process
+
+
+def init_worker(args: List[str], fast: bool):
+    """Setup the :class:`.CParser`, and thereby libclang Index, of a worker-process"""
+
+    global WORKER_PARSER
+
+    WORKER_PARSER = CParser(args, fast=fast)
+
+
+def parse_path(
+    path: Path, parser: Optional[CParser] = None
+) -> Tuple[List[Any], List[Error]]:
+    """
+    Parse the C Header at 'path' into entity-data, using the given 'parser' or
+    the parser of the current worker-process
+    """
+
+    parser = parser if parser else WORKER_PARSER
+
+    return parser.tu_to_data(parser.parse_file(path), path)
+
+
+def write_yace(path: Path, output: Path, entities: Iterable[Dict[str, Any]]) -> int:
+    """
+    Write the Yace-file, in 'output', for the header at 'path'. The given
+    'entities' are written one at a time, as they are produced, thus, when given
+    a generator, such as :meth:`.CParser.tu_to_entities`, then the whole model is
+    never held in memory. The entities are streamed to a temporary file, which
+    then replaces the Yace-file, thus, a failure midway leaves no truncated
+    Yace-file behind. Returns the number of entities written.
+    """
+
+    stem = path.stem
+    meta = {
+        "lic": "Unknown License",
+        "version": "0.0.1",
+        "author": "Foo Bar <foo@example.com>",
+        "project": stem,
+        "prefix": stem,
+        "brief": "Brief Description",
+        "full": "Full Description",
+        "pkg": "",
+    }
+
+    yaml_path = output / path.with_suffix(".yaml").name
+    tmp = temporary_path(yaml_path)
+
+    count = 0
+    try:
+        with tmp.open("x") as yfile:
+            for count, entity in enumerate(entities, 1):
+                if count == 1:
+                    yfile.write("entities:\n")
+                yaml.dump([entity], yfile, Dumper, default_flow_style=None, indent=2)
+
+            if not count:
+                yfile.write("entities: []\n")
+
+            yaml.dump({"meta": meta}, yfile, Dumper, default_flow_style=None, indent=2)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+    os.replace(tmp, yaml_path)
+
+    return count
+
+
+def write_status(path: Path, output: Path, count: int, errors: List[Error]):
+    """Write the status-file, in 'output', for the header at 'path'"""
+
+    status_path = output / path.with_suffix(".status").name
+    with status_path.open("w") as status:
+        status.write(f"Parsed {count} entities")
+        if errors:
+            status.write(f", skipped {len(errors)} constructs")
+        status.write("\n")
+
+        if errors:
+            status.write("\nSkipped:\n")
+            for error in errors:
+                status.write(f"  {error}\n")
+
+
+def header_failure(path: Path, exc: Exception) -> Error:
+    """Log the exception of a C Header failing to parse, return it as an Error"""
+
+    log.error("Path: '%s', exception(%s)", path, exc, exc_info=True)
+
+    return Error(message=f"Failed parsing C Header({path}): {exc}")
+
+
+def c_to_yace(
+    paths: List[Path],
+    output: Path,
+    jobs: int = 1,
+    pch: Optional[List[str]] = None,
+    fast: bool = False,
+) -> Tuple[int, List[Error]]:
     """Best-effort transformation of a C Header to a YACE File
 
     Returns a tuple of (entity_count, errors). The YAML is written regardless
-    of errors — unsupported constructs are skipped and reported.
+    of errors — unsupported constructs are skipped and reported. A C Header
+    failing to parse entirely is reported as an error, and does not prevent
+    writing the Yace-files of the other headers.
+
+    With ``jobs > 1``, then the headers are parsed by a pool of 'jobs'
+    worker-processes, each with their own libclang Index, the Yace-files are
+    written in the order of the given 'paths'.
+
+    With 'pch', then the given headers are pre-compiled once and used when
+    parsing all of the given 'paths', see :meth:`.CParser.create_pch`. With
+    'fast', then the headers are parsed using the fast-mode of :class:`.CParser`.
     """
 
     entity_count = 0
@@ -573,43 +850,47 @@ def c_to_yace(paths: List[Path], output: Path) -> Tuple[int, List[Error]]:
 
     output.mkdir(parents=True, exist_ok=True)
 
-    parser = CParser()
-    for path in [p.resolve() for p in paths]:
-        tu = parser.parse_file(path)
-
-        entities, parse_errors = parser.tu_to_data(tu, path)
-        errors += parse_errors
-        entity_count += len(entities)
-
-        stem = path.stem
-        data = {
-            "meta": {
-                "lic": "Unknown License",
-                "version": "0.0.1",
-                "author": "Foo Bar <foo@example.com>",
-                "project": stem,
-                "prefix": stem,
-                "brief": "Brief Description",
-                "full": "Full Description",
-                "pkg": "",
-            },
-        }
-        data["entities"] = entities
-
-        model = Model(**data)
-        model.to_file(output / path.with_suffix(".yaml").name)
-
-        # Write status file
-        status_path = output / path.with_suffix(".status").name
-        with status_path.open("w") as status:
-            status.write(f"Parsed {len(entities)} entities")
-            if parse_errors:
-                status.write(f", skipped {len(parse_errors)} constructs")
-            status.write("\n")
-
-            if parse_errors:
-                status.write("\nSkipped:\n")
-                for error in parse_errors:
-                    status.write(f"  {error}\n")
+    paths = [p.resolve() for p in paths]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        parser = CParser(fast=fast)
+        if pch:
+            parser.create_pch(pch, Path(tmpdir) / "prefix.pch")
+
+        if jobs > 1 and len(paths) > 1:
+            with ProcessPoolExecutor(
+                max_workers=min(jobs, len(paths)),
+                initializer=init_worker,
+                initargs=(parser.args, fast),
+            ) as pool:
+                futures = [pool.submit(parse_path, path) for path in paths]
+                for path, future in zip(paths, futures):
+                    try:
+                        entities, parse_errors = future.result()
+                        count = write_yace(path, output, entities)
+                    except Exception as exc:
+                        errors.append(header_failure(path, exc))
+                        continue
+
+                    write_status(path, output, count, parse_errors)
+                    errors += parse_errors
+                    entity_count += count
+
+            return entity_count, errors
+
+        for path in paths:
+            parse_errors: List[Error] = []
+            try:
+                count = write_yace(
+                    path,
+                    output,
+                    parser.tu_to_entities(parser.parse_file(path), path, parse_errors),
+                )
+            except Exception as exc:
+                errors.append(header_failure(path, exc))
+                continue
+
+            write_status(path, output, count, parse_errors)
+            errors += parse_errors
+            entity_count += count
 
     return entity_count, errors
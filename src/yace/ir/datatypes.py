@@ -35,11 +35,11 @@ Their Yace IR follows below.
 """
 import inspect
 import sys
-from typing import Literal, Optional, Union
+from typing import Literal, Optional
 
 from pydantic import BaseModel, model_validator
 
-from .base import Entity
+from .base import Entity, tagged_union
 
 
 class Typespec(Entity):
@@ -712,9 +712,13 @@ TypespecShorthand = Literal[
 ]
 
 
+# Union of the datatypes, discriminated by their key, accepting short-hands
+TypespecAny = tagged_union(classes(), shorthand=True)
+
+
 class Typed(BaseModel):
     """
     Attribute-mixin; adding a reqried "has-a" relation to :class:`.Typespec`
     """
 
-    typ: Union[Typespec, TypespecShorthand]
+    typ: TypespecAny
@@ -12,7 +12,7 @@ Their ir representation follows below.
 """
 import typing
 
-from .base import Documented, Entity, Named
+from .base import Documented, Entity, Named, tagged_union
 from .datatypes import Typed
 
 
@@ -61,7 +61,7 @@ class Struct(Entity, Named, Documented):
     """
 
     key: str = "struct_decl"
-    members: typing.List[Field | Bitfield]
+    members: typing.List[tagged_union([Field, Bitfield])]
 
 
 class BitfieldStruct(Entity, Named, Documented):
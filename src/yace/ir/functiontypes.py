@@ -14,7 +14,7 @@ Their Yace-Intermediate-Representation follows below.
 import typing
 
 from .base import Documented, Entity, Named
-from .datatypes import Typed, Typespec
+from .datatypes import Typed, TypespecAny
 
 
 class Parameter(Entity, Named, Typed):
@@ -31,7 +31,7 @@ class Function(Entity, Named, Documented):
     """
 
     key: str = "function_decl"
-    ret: Typespec
+    ret: TypespecAny
     parameters: typing.List[Parameter] = []
 
 
@@ -45,5 +45,5 @@ class FunctionPointer(Entity, Named, Documented):
     """
 
     key: str = "function_pointer_decl"
-    ret: Typespec
+    ret: TypespecAny
     parameters: typing.List[Parameter] = []
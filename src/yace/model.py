@@ -12,17 +12,43 @@ Language-entities.
 
 Their **Yace** Interface Definition Language representation follows below.
 """
+
+import functools
+import hashlib
 import inspect
 import logging
+import mmap
+import os
+import tempfile
 from pathlib import Path
-from typing import ClassVar, List, Union
+from typing import IO, ClassVar, Iterator, List, Optional, Tuple, Union
 
 import yaml
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 
+import yace
 from yace.errors import InvalidModelData
 from yace.ir import base, constants, datatypes, derivedtypes, directives, functiontypes
 
+# The C-accelerated (libyaml) loader and dumper are used when available
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+@functools.cache
+def schema_digest() -> str:
+    """
+    Returns a digest of the **Yace** IR schema, that is, of the version of
+    **yace** and the source of the modules defining the IR entities
+    """
+
+    sha = hashlib.sha256(yace.__version__.encode())
+    for module in [base, constants, datatypes, derivedtypes, directives, functiontypes]:
+        sha.update(Path(module.__file__).read_bytes())
+    sha.update(Path(__file__).read_bytes())
+
+    return sha.hexdigest()
+
 
 class Meta(BaseModel):
     """
@@ -67,106 +93,113 @@ class Model(BaseModel):
 
     meta: Meta
     entities: List[
-        Union[
-            constants.Define,
-            constants.Enum,
-            derivedtypes.Struct,
-            derivedtypes.Union,
-            functiontypes.Function,
-            functiontypes.FunctionPointer,
-            directives.IncludeDirective,
-        ]
+        base.tagged_union(
+            [
+                constants.Define,
+                constants.Enum,
+                derivedtypes.Struct,
+                derivedtypes.Union,
+                functiontypes.Function,
+                functiontypes.FunctionPointer,
+                directives.IncludeDirective,
+            ]
+        )
     ] = Field(default_factory=list)
 
     @classmethod
-    def entity_from_data(cls, cur: dict, parent=None, depth=0):
+    def from_data(cls, meta: dict, entities: list):
         """
-        Walk 'cur' recursively with depth-count and "short-hand" expansion
+        Construct a :class:`Model` using the given 'meta' and 'entities'
 
-        A tree-walk is needed as just invoking the dataclass-constructor::
+        The entity-data is validated, and short-hands expanded, by pydantic in a
+        single call, as the entities are unions discriminated by their 'key',
+        see :func:`yace.ir.base.tagged_union`. Raises
+        :class:`yace.errors.InvalidModelData` when the data is not valid.
+        """
 
-            entity = Model.MAPPING["struct"](data)
+        logging.debug(f"Validating {len(entities)} entities")
 
-        Would not instantiate members, parameters, typ, etc. additionally,
-        the short-hands are expanded:
+        try:
+            return cls.model_validate({"meta": meta, "entities": entities})
+        except ValidationError as exc:
+            raise InvalidModelData(str(exc)) from exc
 
-        - Integer literals
+    @classmethod
+    def from_path(cls, path: Union[Path, IO, mmap.mmap]):
+        """
+        Returns a dict composed of the merged content of all yaml-files in the
+        given 'path'
 
-          - {typ: 10} instead of {typ: {cls: dec, val: 10}}
+        The 'path' can also be an open stream, or mmap, of a Yace-file. Either
+        way, the YAML is scanned from the stream, rather than reading the whole
+        text into memory first.
+        """
 
-        - Data Types
+        if isinstance(path, (str, Path)):
+            with Path(path).open("rb") as stream:
+                return cls.from_data(**yaml.load(stream, Loader=Loader))
 
-          - {typ: u16} instead of {typ: {cls: u16}}
+        return cls.from_data(**yaml.load(path, Loader=Loader))
 
-        Foo...
+    @classmethod
+    def from_path_cached(cls, path: Path, cachedir: Optional[Path] = None):
+        """
+        Returns the :class:`.Model` of the Yace-file at 'path', like
+        :meth:`.Model.from_path`, however, the loaded model is stored as a
+        snapshot in 'cachedir', or next to the Yace-file, and re-used as long as
+        neither the Yace-file nor the IR schema changes.
+
+        The snapshot is the JSON dump of the model, which is validated when
+        loaded, thus, it is data only, and cannot execute code, regardless of
+        who can write to 'cachedir'. Loading it skips the YAML scanning, which
+        is the bulk of the time spent by :meth:`.Model.from_path`.
         """
 
-        if type(cur) not in [int, str, dict]:
-            raise InvalidModelData(f"Invalid type: {cur}")
-        elif type(cur) in [dict] and "key" not in cur:
-            raise InvalidModelData(f"Missing 'key' in {cur}")
-
-        if isinstance(cur, int):  # short-hand for integer-literal
-            return constants.Dec(**{"lit": cur})
-        elif isinstance(cur, str):  # short-hand for typ
-            typ = Model.MAPPING.get(cur)
-            if not typ:
-                raise InvalidModelData(f"typ !short-hand: '{cur}'")
-
-            return typ()
-
-        constructor = Model.MAPPING.get(cur["key"])
-        if not constructor:
-            raise InvalidModelData(f"No constructor for '{cur}'")
-
-        attributes = {}
-        for attr, attr_data in cur.items():
-            if attr in ["typ", "ret", "val"]:
-                attributes[attr] = Model.entity_from_data(attr_data, cur, depth)
-            elif attr in ["members", "parameters"]:
-                attributes[attr] = [
-                    Model.entity_from_data(child, cur, depth + 1)
-                    for child in cur.get(attr)
-                ]
-            else:
-                attributes[attr] = attr_data
-
-        return constructor(**attributes)
+        content = path.read_bytes()
+        key = hashlib.sha256(schema_digest().encode() + content).hexdigest()
 
-    @classmethod
-    def from_data(cls, meta: dict, entities: list):
-        """Construct a :class:`Model` using the given 'meta' and 'entities'"""
+        cachedir = cachedir if cachedir else path.parent
+        name = hashlib.sha256(str(path.resolve()).encode()).hexdigest()[:16]
+        cpath = cachedir / f"{path.stem}-{name}.json"
 
-        interface = cls(meta=meta)
+        try:
+            with cpath.open("rb") as cfile:
+                if cfile.readline().decode().strip() == key:
+                    return cls.model_validate_json(cfile.read())
+        except FileNotFoundError:
+            pass
+        except Exception as exc:
+            logging.debug(f"Ignoring snapshot({cpath}); exc({exc})")
 
-        total = len(entities)
-        for count, entity_data in enumerate(entities, 1):
-            logging.debug(f"Processing {count} / {total}")
-            logging.debug(f"entity_data({entity_data})")
-            entity = cls.entity_from_data(entity_data)
-            interface.entities.append(entity)
+        model = cls.from_data(**yaml.load(content, Loader=Loader))
 
-        return interface
+        cachedir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=cachedir, prefix=f".{cpath.name}.")
+        with os.fdopen(fd, "w") as cfile:
+            cfile.write(key + "\n")
+            cfile.write(model.model_dump_json(exclude_unset=True))
+        os.replace(tmp, cpath)
 
-    @classmethod
-    def from_path(cls, path: Path):
-        """
-        Returns a dict composed of the merged content of all yaml-files in the
-        given 'path'
-        """
+        return model
 
-        return cls.from_data(**yaml.safe_load(path.read_text()))
+    def to_file(self, path: Union[Path, IO]):
+        """Write to file, or to an open stream"""
 
-    def to_file(self, path):
-        """Write to file"""
+        data = self.model_dump(exclude_unset=True, exclude_none=True)
 
-        path.write_text(
-            yaml.dump(
-                self.model_dump(exclude_unset=True, exclude_none=True),
-                default_flow_style=None,
-                indent=2,
-            )
-        )
+        if isinstance(path, (str, Path)):
+            with Path(path).open("w") as stream:
+                yaml.dump(data, stream, Dumper, default_flow_style=None, indent=2)
+            return
+
+        yaml.dump(data, path, Dumper, default_flow_style=None, indent=2)
+
+
+@functools.cache
+def entity_fields(cls) -> frozenset:
+    """Returns the names of the fields of the given entity-class, computed once"""
+
+    return frozenset(cls.model_fields)
 
 
 class ModelWalker(object):
@@ -176,46 +209,74 @@ class ModelWalker(object):
     This is useful for inspecting properties of the model.
 
     **HOWTO**: sub-class this and implement the visit() method
+
+    The walk is a pre-order traversal done iteratively, with an explicit stack,
+    rather than by recursion. The 'ancestors' given to visit() is a single list
+    shared by all visits, thus, it is only valid for the duration of the call;
+    copy it if it is needed afterwards.
     """
 
+    ATTRS = ["members", "parameters", "typ", "ret", "val"]  # Attributes to descend
+
+    KEYS: Optional[List[str]] = None  # Keys of entities visited, None means all
+    FUSABLE = True  # Can be run in the same walk as other walkers
+
     def __init__(self, model):
         self.model = model
 
-    def _traverse(
-        self,
-        cur,
-        ancestors: List,
-        depth: int = 0,
-    ) -> List:
+    def visits(self) -> Iterator[Tuple[bool, Optional[str]]]:
         """
-        Recursive walk of the 'cur' entity, returning a list of visit()
-        results.
+        Walks the :class:`.Model` invoking visit(), yielding the result of each
+        visit as soon as it is produced
         """
 
-        res = [self.visit(cur, ancestors, depth)]
-        for attr in ["members", "parameters", "typ", "ret", "val"]:
-            other = getattr(cur, attr, None)
-            if other is None:
-                continue
+        ancestors: List = []
+        stack = [(entity, 0) for entity in reversed(self.model.entities)]
+        while stack:
+            cur, depth = stack.pop()
+            del ancestors[depth:]
+
+            yield self.visit(cur, ancestors, depth)
+
+            children = []
+            for attr in ModelWalker.ATTRS:
+                other = getattr(cur, attr, None)
+                if other is None:
+                    continue
+
+                if attr in ["members", "parameters"]:
+                    children.extend(other)
+                else:
+                    children.append(other)
 
-            if attr in ["members", "parameters"]:
-                for child in other:
-                    res += self._traverse(child, ancestors + [cur], depth + 1)
-            else:
-                res += self._traverse(other, ancestors + [cur], depth + 1)
+            if children:
+                ancestors.append(cur)
+                stack.extend((child, depth + 1) for child in reversed(children))
 
-        return res
+    def walk(self) -> bool:
+        """
+        Walks the :class:`.Model` invoking visit(), returns True when all visits
+        succeed, stopping at the first visit which does not
+        """
+
+        for ok, message in self.visits():
+            if not ok:
+                logging.error(f"{type(self).__name__}: {message}")
+                return False
 
-    def walk(self):
-        """Walks the :class:`.Model` invoking visit()"""
+        return True
 
-        status = []
-        for entity in self.model.entities:
-            status += self._traverse(entity, [], 0)
+    @staticmethod
+    def has_field(entity, name: str) -> bool:
+        """
+        Returns True when the given 'entity' has a field named 'name', this is
+        based on the schema of the entity-class, thus, unlike inspecting e.g.
+        ``entity.model_dump()``, the entity is not serialized
+        """
 
-        return status
+        return name in entity_fields(type(entity))
 
-    def visit(self, current, ancestors, depth):
+    def visit(self, current, ancestors, depth) -> Tuple[bool, Optional[str]]:
         """This is the thing which class should implement"""
 
         return (True, None)
@@ -0,0 +1,53 @@
+"""
+The compiler-targets of **yace**. The builtin targets are imported on demand,
+rather than when **yace** is imported, such that the command-line interface
+only pays for loading the targets, and their dependencies, actually selected.
+"""
+
+import importlib
+import typing
+
+BUILTIN = {
+    "capi": ("yace.targets.capi.target", "CAPI"),
+    "ctypes": ("yace.targets.ctypes.target", "Ctypes"),
+}
+
+
+def load(names: typing.Iterable[str]) -> typing.List[type]:
+    """
+    Returns the target-classes with the given 'names'. Builtin targets are
+    imported by name, only when a name is not a builtin target, is the current
+    workdir searched for targets, see :func:`yace.targets.collector.collect`.
+    Raises KeyError when a name does not match any target.
+    """
+
+    names = list(dict.fromkeys(names))
+
+    found = {}
+    for name in names:
+        if name in BUILTIN:
+            modname, clsname = BUILTIN[name]
+            found[name] = getattr(importlib.import_module(modname), clsname)
+
+    if len(found) != len(names):
+        from yace.targets.collector import collect
+
+        for target in collect():
+            if target.NAME in names:
+                found.setdefault(target.NAME, target)
+
+    missing = [name for name in names if name not in found]
+    if missing:
+        raise KeyError(f"Unknown target(s): {missing}")
+
+    return [found[name] for name in names]
+
+
+def available() -> typing.List[type]:
+    """Returns the builtin targets along with those in the current workdir"""
+
+    from yace.targets.collector import collect
+
+    targets = load(BUILTIN)
+
+    return targets + [target for target in collect() if target not in targets]
@@ -24,19 +24,29 @@ The 'format' stage also emits the files:
 * ``hdr.clang-format`` -- clang-format rule-file for header-files
 * ``src.clang-format`` -- clang-format rule-file for source-files
 
+The 'check' stage builds, and runs, the program:
+
+* ``{meta.prefix}_check``     -- Built from ``{meta.prefix}_check.c``
+
+The objects it is linked from are cached in ``.yace-cache/objects``.
+
 Thus, the above files are what you should expect to see in the output-directory
 """
 
-import copy
+import hashlib
 import logging as log
-import shutil
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import List, Optional, Tuple
 
+from yace.cache import BuildCache
 from yace.emitters import Emitter
 from yace.errors import TransformationError
-from yace.targets.target import Target
-from yace.tools import ClangFormat, Doxygen, Gcc
-from yace.transformations import CStyle
+from yace.targets.target import Target, output_lock, write_if_changed
+from yace.tools import ClangFormat, Doxygen, Gcc, PkgConfig, Tool
+from yace.transformations import CStyle, PassManager
 
 
 def emit_cstr_fmt(typespec):
@@ -75,16 +85,15 @@ class CAPI(Target):
 
         * Transform symbols according to :class:`yace.transformation.CStyle`
 
-        That it currently the only thing done to the **yace** IR.
+        That it currently the only thing done to the **yace** IR. The model is
+        transformed in-place, as the :class:`yace.compiler.Compiler` provides
+        each target with a model of its own.
         """
 
-        transformed = copy.deepcopy(model)
-
-        status = CStyle(transformed).walk()
-        if not all([res for res in status]):
+        if not PassManager(model, [CStyle]).walk():
             raise TransformationError("The CStyle transformation failed")
 
-        return transformed
+        return model
 
     def emit(self, model):
         """Emit code"""
@@ -104,64 +113,152 @@ class CAPI(Target):
         ]
         for filename, template, container in files:
             path = (self.output / filename).resolve()
-            with (path).open("w") as file:
-                content = self.emitter.render(
-                    template,
-                    {
-                        "meta": model.meta,
-                        "entities": model.entities,
-                        "headers": self.headers,
-                    },
-                    filters,
-                )
-                if content[-1] != "\n":
-                    content += "\n"
-                file.write(content)
-
-            log.info("produced: %s", path)
-            container.append(path)
+            content = self.emitter.render(
+                template,
+                {
+                    "meta": model.meta,
+                    "entities": model.entities,
+                    "headers": self.headers,
+                },
+                filters,
+            )
+            if content[-1] != "\n":
+                content += "\n"
+
+            self.produce(path, content, container)
+
+    def format_str(self, path: Path, content: str) -> Optional[str]:
+        """Returns the content of .c and .h files formatted by clang-format"""
+
+        style = {
+            ".c": ClangFormat.CLANGFORMAT_STYLE_C,
+            ".h": ClangFormat.CLANGFORMAT_STYLE_H,
+        }.get(path.suffix)
+        if style is None:
+            return content
+
+        formatted = self.tools["clang-format"].format_str(content, style, path.name)
+
+        return content if formatted is None else formatted
 
     def format(self):
         """
-        Transfer the clang-format definition from package to output and
-        invokes the clang-formater
+        Transfer the clang-format definition from package to output, then
+        format and write the emitted files which changed, and generate the
+        documentation using doxygen, when any of the headers changed
         """
 
         path = Path(__file__).parent
-        for rules, container in [
-            (ClangFormat.CLANGFORMAT_STYLE_C, self.sources),
-            (ClangFormat.CLANGFORMAT_STYLE_H, self.headers),
-        ]:
-            shutil.copyfile(path / rules, self.output / rules)
-            self.tools["clang-format"].run(
-                [f"--style=file:{rules}", "-i"] + [str(f) for f in container],
-            )
+        for rules in [ClangFormat.CLANGFORMAT_STYLE_C, ClangFormat.CLANGFORMAT_STYLE_H]:
+            self.copy_resource(path / rules, self.output / rules)
+
+        conf = (self.output / Doxygen.DOXYGEN_CONF).resolve()
+        content = self.pending.get(conf)
+
+        written = self.flush(formatting=True)
+
+        report = self.output / "doxyreport"
+        if report.exists() and not set(written) & set(self.headers + self.aux):
+            log.info("Headers unchanged; skipping doxygen")
+            return
 
-        self.tools["doxygen"].run([Doxygen.DOXYGEN_CONF])
+        # Other Yace-files, processed concurrently, write their configuration to
+        # the same file, thus, it is written again, and run, holding the lock
+        with output_lock(self.output):
+            if content is not None:
+                write_if_changed(conf, content)
+            self.tools["doxygen"].run([Doxygen.DOXYGEN_CONF])
+
+    def compile(self, source: Path, cflags: List[str]) -> Tuple[int, Optional[Path]]:
+        """
+        Compile the given 'source' to an object, returns the return-code of the
+        compiler and the path to the object.
+
+        Objects are cached, ccache-style, in the output directory, keyed by the
+        preprocessed 'source', the 'cflags', and the version of the compiler.
+        Thus, when the emitted code is unchanged, then only the preprocessor is
+        invoked.
+        """
+
+        gcc = self.tools["gcc"]
+
+        proc = gcc.execute(cflags + ["-E", str(source)])
+        if proc.returncode:
+            return gcc.log(cflags + ["-E", str(source)], proc), None
+
+        sha = hashlib.sha256()
+        for part in [gcc.version(), " ".join(cflags)]:
+            sha.update(part.encode())
+            sha.update(b"\0")
+        sha.update(proc.stdout)
+
+        objects = self.output / BuildCache.DIRNAME / "objects"
+        obj = objects / f"{source.stem}-{sha.hexdigest()[:16]}.o"
+        if obj.exists():
+            log.info("cached: %s", obj)
+            return 0, obj
+
+        objects.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=objects, suffix=".o.tmp")
+        os.close(fd)
+
+        rcode, _ = gcc.run(cflags + ["-c", str(source), "-o", tmp])
+        if rcode:
+            os.unlink(tmp)
+            return rcode, None
+
+        os.replace(tmp, obj)
+        for stale in objects.glob(f"{source.stem}-*.o"):
+            if stale != obj:
+                stale.unlink(missing_ok=True)
+
+        return 0, obj
 
     def check(self, model):
-        """Build generated sources and run the generated test-program"""
+        """
+        Build generated sources and run the generated test-program, returns the
+        non-zero return-code of the compiler, linker, or test-program on error.
+
+        The sources are compiled to objects concurrently, see
+        :meth:`.CAPI.compile`, and then linked into the test-program
+        ``{meta.prefix}_check``. The functions declared by the model are
+        provided by the library given by ``meta.pkg``, thus, without it, then
+        only the objects are compiled, unless the model declares no functions.
+        """
 
         extra_cflags = []
         extra_ldflags = []
         if model.meta.pkg:
-            from subprocess import check_output
+            pkgconfig = PkgConfig(self.output)
+            extra_cflags = pkgconfig.cflags(model.meta.pkg)
+            extra_ldflags = pkgconfig.libs(model.meta.pkg)
 
-            extra_cflags = (
-                check_output(["pkg-config", "--cflags", model.meta.pkg])
-                .decode()
-                .split()
-            )
-            extra_ldflags = (
-                check_output(["pkg-config", "--libs", model.meta.pkg])
-                .decode()
-                .split()
+        cflags = CAPI.CFLAGS + ["-I", str(self.output)] + extra_cflags
+
+        with ThreadPoolExecutor(max_workers=max(1, len(self.sources))) as executor:
+            results = list(
+                executor.map(lambda src: self.compile(src, cflags), self.sources)
             )
 
-        self.tools["gcc"].run(
-            CAPI.CFLAGS
-            + ["-I", str(self.output)]
-            + extra_cflags
-            + [str(p) for p in self.sources]
-            + extra_ldflags
+        rcode = next((rcode for rcode, _ in results if rcode), 0)
+        if rcode:
+            return rcode
+
+        functions = [e for e in model.entities if e.key == "function_decl"]
+        if functions and not model.meta.pkg:
+            log.info("No 'meta.pkg' providing the functions; skipping link")
+            return 0
+
+        program = (self.output / f"{model.meta.prefix}_check").resolve()
+        rcode, _ = self.tools["gcc"].run(
+            [str(obj) for _, obj in results] + extra_ldflags + ["-o", str(program)]
         )
+        if rcode:
+            return rcode
+
+        if program not in self.aux:
+            self.aux.append(program)
+
+        rcode, _ = Tool(str(program), self.output).run([])
+
+        return rcode
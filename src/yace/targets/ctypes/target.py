@@ -4,16 +4,15 @@ ignores them, except for the special-case "c_char_p".
 
 """
 
-import copy
 import logging as log
-import shutil
 from pathlib import Path
+from typing import List, Optional
 
 from yace.emitters import Emitter
 from yace.errors import TransformationError
-from yace.targets.target import Target
-from yace.tools import Black, Isort, Python3
-from yace.transformations import Camelizer
+from yace.targets.target import Target, digest_str
+from yace.tools import Black, Isort, Python3, run_concurrently
+from yace.transformations import Camelizer, PassManager
 
 
 class Ctypes(Target):
@@ -40,24 +39,23 @@ class Ctypes(Target):
 
         * Transform symbols according to :class:`yace.transformation.CStyle`
 
-        That it currently the only thing done to the **yace** IR.
+        That it currently the only thing done to the **yace** IR. The model is
+        transformed in-place, as the :class:`yace.compiler.Compiler` provides
+        each target with a model of its own.
         """
 
-        transformed = copy.deepcopy(model)
-
-        status = Camelizer(transformed).walk()
-        if not all([res for res in status]):
+        if not PassManager(model, [Camelizer]).walk():
             raise TransformationError("The CStyle transformation failed")
 
-        return transformed
+        return model
 
     def emit(self, model):
         """Emit code"""
 
-        # Copy the generic ctypes-sugar from resources
+        # The generic ctypes-sugar from resources
         sugar_path = (self.output / "ctypes_sugar.py").resolve()
-        shutil.copyfile(Path(__file__).parent / sugar_path.name, sugar_path)
-        self.sources.append(sugar_path)
+        sugar = (Path(__file__).parent / sugar_path.name).read_text()
+        self.produce(sugar_path, sugar, self.sources)
 
         # Generate the bindings / Python API
         files = [
@@ -65,27 +63,61 @@ class Ctypes(Target):
             ((self.output / f"{model.meta.prefix}_check.py").resolve(), "file_check"),
         ]
         for path, template in files:
-            with path.open("w") as file:
-                file.write(
-                    self.emitter.render(
-                        template,
-                        {
-                            "meta": model.meta,
-                            "entities": model.entities,
-                            "headers": self.headers,
-                        },
-                        {},
-                    )
-                )
-            self.sources.append(path)
+            content = self.emitter.render(
+                template,
+                {
+                    "meta": model.meta,
+                    "entities": model.entities,
+                    "headers": self.headers,
+                },
+                {},
+            )
+            self.produce(path, content, self.sources)
+
+    def format_str(self, path: Path, content: str) -> Optional[str]:
+        """
+        Returns 'content' formatted by 'black' and then 'isort' in-process, or
+        None when either of the libraries is not available
+        """
+
+        for tool in ["black", "isort"]:
+            content = self.tools[tool].format_str(content)
+            if content is None:
+                return None
+
+        return content
+
+    def formatter(self) -> str:
+        """
+        Returns the identity of the formatting, see :meth:`.Target.formatter`,
+        including the configuration of ``black`` found for the output directory
+        """
+
+        path = self.tools["black"].config()
+
+        return digest_str(
+            super().formatter() + (Path(path).read_text() if path else "")
+        )
+
+    def format_files(self, paths: List[Path]):
+        """Format the files at 'paths' by invoking 'black' and then 'isort'"""
+
+        run_concurrently(
+            [
+                [(self.tools[tool], [str(path)]) for tool in ["black", "isort"]]
+                for path in paths
+            ]
+        )
 
     def format(self):
         """
-        Run 'black' and 'isort' on self.sources
+        Format, in-process, and write the emitted sources which changed, see
+        :meth:`.Ctypes.format_str`. When the libraries are not available, then
+        the sources are written and formatted by the executables, see
+        :meth:`.Ctypes.format_files`.
         """
 
-        for tool in ["black", "isort"]:
-            self.tools[tool].run([str(path) for path in self.sources])
+        self.flush(formatting=True)
 
     def check(self, model):
         """Build generated sources and run the generated test-program"""
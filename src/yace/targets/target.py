@@ -1,9 +1,75 @@
-"""
-
-"""
+""" """
 
+import filecmp
+import hashlib
+import inspect
+import json
+import logging as log
 import os
+import shutil
+import threading
+import uuid
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from yace.cache import BuildCache, digest_dir
+
+MANIFEST_LOCK = threading.Lock()  # Serializes updates of the manifests of flush()
+
+OUTPUT_LOCKS: Dict[Path, threading.Lock] = {}  # See output_lock()
+OUTPUT_LOCKS_LOCK = threading.Lock()
+
+
+def output_lock(path: Path) -> threading.Lock:
+    """
+    Returns the lock of the output directory at 'path'. Yace-files processed
+    concurrently share the output directory of a target, thus, side-effects on
+    shared files, e.g. resources, or running a tool on a shared configuration,
+    are done while holding the lock.
+    """
+
+    with OUTPUT_LOCKS_LOCK:
+        return OUTPUT_LOCKS.setdefault(Path(path).resolve(), threading.Lock())
+
+
+def digest_str(content: str) -> str:
+    """Returns the sha256 hex-digest of the given 'content'"""
+
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def temporary_path(path: Path) -> Path:
+    """
+    Returns a unique path, next to 'path', for writing a file which then
+    atomically replaces 'path'. Unlike tempfile.mkstemp(), the file is created
+    by the caller, thus with the permissions given by the umask.
+    """
+
+    return path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """
+    Write 'content' to the file at 'path', when the file does not exist or has
+    different content, by atomically replacing it. Thus, the modification-time
+    of unchanged files are left as-is, and no-one observes a partially written
+    file. Returns True when the file is written.
+    """
+
+    try:
+        if path.read_text() == content:
+            return False
+    except (OSError, UnicodeDecodeError):
+        pass
+
+    tmp = temporary_path(path)
+    with tmp.open("x") as file:
+        file.write(content)
+    os.replace(tmp, path)
+
+    return True
 
 
 class Target(ABC):
@@ -26,6 +92,8 @@ class Target(ABC):
 
         self.tools = {}  # Dictionary of :class:`yace.tools.Tool` instances
 
+        self.pending: Dict[Path, str] = {}  # Content produced, yet to be written
+
         os.makedirs(self.output, exist_ok=True)
 
     def is_ready(self):
@@ -33,17 +101,160 @@ class Target(ABC):
 
         return all([tool.exists() for label, tool in self.tools.items()])
 
+    def copy_resource(self, src: Path, dst: Path):
+        """
+        Copy the resource at 'src' to 'dst', e.g. a style-definition or a helper
+        module. The copy is skipped when 'dst' has the same content as 'src', and
+        otherwise replaces 'dst' atomically, such that targets processing multiple
+        files concurrently never observe a partially written resource.
+        """
+
+        with output_lock(self.output):
+            if dst.exists() and filecmp.cmp(src, dst, shallow=False):
+                return
+
+            tmp = temporary_path(dst)
+            shutil.copyfile(src, tmp)
+            os.replace(tmp, dst)
+
+    def produce(self, path: Path, content: str, container: List[Path]):
+        """
+        Add the rendered 'content' of the file at 'path' to 'container', e.g.
+        self.headers. The content is kept in memory until written by
+        :meth:`.Target.flush`.
+        """
+
+        self.pending[path] = content
+        container.append(path)
+
+    def format_str(self, path: Path, content: str) -> Optional[str]:
+        """
+        Returns the 'content' of the file at 'path' formatted in-memory, or None
+        when the target cannot do so, in which case the file is written as-is
+        and formatted by :meth:`.Target.format_files`. Override this in targets
+        where formatting applies.
+        """
+
+        return content
+
+    def format_files(self, paths: List[Path]):
+        """Format the files at 'paths' in-place, e.g. by invoking tools"""
+
+    def formatter(self) -> str:
+        """
+        Returns the identity of the formatting done by the target, that is, the
+        digest of the versions of its tools, and of the files in the directory
+        of the target, e.g. style-definitions. Override this in targets where
+        formatting depends on more, e.g. configuration-files of the tools.
+        """
+
+        sha = hashlib.sha256()
+        for part in [digest_dir(Path(inspect.getfile(type(self))).parent)] + [
+            f"{label}: {tool.version()}" for label, tool in sorted(self.tools.items())
+        ]:
+            sha.update(part.encode())
+            sha.update(b"\0")
+
+        return sha.hexdigest()
+
+    def flush(self, formatting: bool = False) -> List[Path]:
+        """
+        Write the content produced by :meth:`.Target.produce`, formatted when
+        'formatting' is True, and return the paths of the files written.
+
+        A manifest, in the output directory, records, for every file, the
+        digest of the content rendered, the formatter, see
+        :meth:`.Target.formatter`, and the digest of the content written. When
+        the rendered content and the formatter are the same as last time, and
+        the file on disk is unchanged since it was written, then the file is
+        neither formatted nor written. Otherwise, then the file is only written,
+        atomically, when the content differs from what is on disk. See
+        :func:`.write_if_changed`.
+        """
+
+        manifest_path = self.output / BuildCache.DIRNAME / "outputs.json"
+
+        def load_manifest() -> dict:
+            try:
+                return json.loads(manifest_path.read_text())
+            except (OSError, ValueError):
+                return {}
+
+        manifest = load_manifest()
+        formatter = self.formatter() if formatting else None
+
+        def unchanged(path: Path, rendered: str) -> bool:
+            entry = manifest.get(str(path), {})
+            if entry.get("rendered") != rendered:
+                return False
+            if entry.get("formatted") != formatter:
+                return False
+            try:
+                return digest_str(path.read_text()) == entry.get("written")
+            except (OSError, UnicodeDecodeError):
+                return False
+
+        def prepare(path: Path, content: str) -> Optional[str]:
+            return self.format_str(path, content) if formatting else content
+
+        rendered = {path: digest_str(content) for path, content in self.pending.items()}
+        changed = [path for path in self.pending if not unchanged(path, rendered[path])]
+
+        with ThreadPoolExecutor(max_workers=max(1, len(changed))) as executor:
+            prepared = list(
+                executor.map(lambda p: prepare(p, self.pending[p]), changed)
+            )
+
+        written = []
+        unformatted = []
+        for path, content in zip(changed, prepared):
+            if content is None:
+                content = self.pending[path]
+                unformatted.append(path)
+            if write_if_changed(path, content):
+                log.info("produced: %s", path)
+                written.append(path)
+
+        if unformatted:
+            self.format_files(unformatted)
+
+        entries = {
+            str(path): {
+                "rendered": rendered[path],
+                "formatted": formatter,
+                "written": digest_str(path.read_text()),
+            }
+            for path in changed
+        }
+        self.pending = {}
+
+        # Other files, processed concurrently, can share the output directory,
+        # thus, the manifest is re-read and updated while holding the lock
+        with MANIFEST_LOCK:
+            manifest = load_manifest()
+            manifest.update(entries)
+            manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            write_if_changed(
+                manifest_path, json.dumps(manifest, indent=2, sort_keys=True)
+            )
+
+        return written
+
     @abstractmethod
     def transform(self, model):
         """
-        Transform the given model for code-emission.
+        Transform the given model for code-emission. The model given by the
+        :class:`yace.compiler.Compiler` is owned by the target, thus, it can
+        be transformed in-place, rather than transforming a copy.
         """
 
     @abstractmethod
     def emit(self, model):
         """
         Emit code for the given model, using your weapons of choice, common
-        choice would be to utilize an instance of the class:`.Emitter`.
+        choice would be to utilize an instance of the class:`.Emitter`. Content
+        given to :meth:`.Target.produce` is written by :meth:`.Target.flush`,
+        which the :class:`yace.compiler.Compiler` does when not formatting.
         """
 
     @abstractmethod
@@ -51,7 +262,8 @@ class Target(ABC):
         """
         Format the emitted source-code, e.g. call tools such as clang-format,
         black, isort, rustfmt, etc. depending of what applies to the generated
-        code.
+        code. Usually by :meth:`.Target.flush` with 'formatting', thus,
+        formatting only the files which changed.
         """
 
     @abstractmethod
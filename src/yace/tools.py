@@ -7,6 +7,7 @@ around executables. A brief overview:
 * :class:`.Doxygen`
 * :class:`.Gcc`
 * :class:`.Isort`
+* :class:`.PkgConfig`
 
 The tools listed above can be classified in the following two categories.
 
@@ -38,12 +39,215 @@ Interpreters
 ============
 
 ...
+
+Concurrency
+===========
+
+Invocations of tools are independent processes, thus, targets run independent
+invocations, e.g. formatting different files, concurrently using
+:func:`.run_concurrently`. The total number of tool-invocations executing at
+the same time, also across targets and Yace-files, is limited by
+:attr:`.Tool.CONCURRENCY`, see :meth:`.Tool.set_concurrency`.
 """
 
+import importlib
+import json
 import logging as log
+import os
+import shutil
+import tempfile
+import threading
+import types
 import typing
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from subprocess import STDOUT, run
+from subprocess import PIPE, STDOUT, run
+
+from yace import trace
+from yace.errors import ToolError
+
+
+class ToolRegistry(object):
+    """
+    Discovery of the executables used by the tools. Executables are resolved
+    via PATH lookup, and the results of probing them, such as the output of
+    '--version' or the flags given by 'pkg-config', are cached per process and
+    on disk. A cached result is invalidated when any of the files it was
+    derived from, e.g. the executable, changes modification-time or size.
+
+    The on-disk cache is located by :meth:`.ToolRegistry.default_path`, setting
+    the environment variable ``YACE_TOOL_CACHE`` to the empty string disables
+    it, leaving only the per-process cache.
+    """
+
+    def __init__(self, path: typing.Optional[Path] = None):
+        self.path = path
+        self.lock = threading.Lock()
+        self.paths: typing.Dict[str, typing.Optional[str]] = {}  # PATH lookups
+        self.entries: typing.Dict[str, dict] = self.load()
+
+    @staticmethod
+    def default_path() -> typing.Optional[Path]:
+        """Returns the path to the on-disk cache, None when it is disabled"""
+
+        path = os.environ.get("YACE_TOOL_CACHE")
+        if path is not None:
+            return Path(path) if path else None
+
+        cachedir = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+
+        return Path(cachedir) / "yace" / "tools.json"
+
+    @staticmethod
+    def stamp(path: str) -> typing.Optional[typing.List[int]]:
+        """Returns modification-time and size of the file at 'path', if any"""
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def load(self) -> typing.Dict[str, dict]:
+        """Returns the entries of the on-disk cache, empty when unreadable"""
+
+        if self.path is None:
+            return {}
+
+        try:
+            with self.path.open() as cachefile:
+                return json.load(cachefile)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        """Atomically writes the entries, merged with those on disk, to disk"""
+
+        if self.path is None:
+            return
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            entries = {**self.load(), **self.entries}
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as cachefile:
+                json.dump(entries, cachefile, indent=2, sort_keys=True)
+            os.replace(tmp, self.path)
+        except OSError as exc:
+            log.debug("Failed writing tool-cache(%s): %s", self.path, exc)
+
+    def which(self, executable: str) -> typing.Optional[str]:
+        """
+        Returns the path of 'executable' in PATH, None when missing. The path is
+        as found, not resolved, as symlinks and wrappers, e.g. alternatives or
+        compiler-cache masquerades, can depend on the name they are invoked by.
+        """
+
+        with self.lock:
+            if executable not in self.paths:
+                self.paths[executable] = shutil.which(executable)
+
+            return self.paths[executable]
+
+    def cached(
+        self,
+        key: str,
+        files: typing.List[str],
+        compute: typing.Callable[[], typing.Tuple[typing.Any, typing.List[str]]],
+    ):
+        """
+        Returns the value cached under 'key', when the 'files' it was derived
+        from are unchanged. Otherwise, the value is computed by 'compute()',
+        which returns the value along with any additional files it was derived
+        from, and then cached. The files are recorded along with the path they
+        resolve to, and stamped by that, such that both retargeting a symlink,
+        and changing the file it points to, are noticed.
+        """
+
+        def is_valid(path: str, record) -> bool:
+            return (
+                isinstance(record, dict)
+                and os.path.realpath(path) == record.get("resolved")
+                and self.stamp(record["resolved"]) == record.get("stamp")
+            )
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and all(
+                is_valid(path, record) for path, record in entry["files"].items()
+            ):
+                return entry["value"]
+
+        value, extra = compute()
+
+        with self.lock:
+            self.entries[key] = {
+                "files": {
+                    path: {
+                        "resolved": os.path.realpath(path),
+                        "stamp": self.stamp(os.path.realpath(path)),
+                    }
+                    for path in files + extra
+                },
+                "value": value,
+            }
+            self.save()
+
+        return value
+
+    def probe(self, executable: str, cwd) -> typing.Optional[dict]:
+        """
+        Returns the return-code and output of invoking 'executable' with
+        '--version', None when the executable does not exist
+        """
+
+        path = self.which(executable)
+        if path is None:
+            return None
+
+        def compute():
+            proc = run(
+                [path, "--version"], stdout=PIPE, stderr=STDOUT, check=False, cwd=cwd
+            )
+            version = proc.stdout.decode(errors="replace").strip()
+
+            return {"rcode": proc.returncode, "version": version}, []
+
+        return self.cached(f"probe:{path}", [path], compute)
+
+
+IMPORT_LOCK = threading.Lock()  # Serializes imports of optional libraries
+
+
+def import_optional(name: str) -> typing.Optional[types.ModuleType]:
+    """
+    Returns the module 'name', e.g. a library used by a tool in-process, or
+    None when it is not available. Imports are serialized, such that threads
+    never observe a partially initialized module.
+    """
+
+    with IMPORT_LOCK:
+        try:
+            return importlib.import_module(name)
+        except ImportError:
+            return None
+
+
+REGISTRY: typing.Optional[ToolRegistry] = None  # See registry()
+REGISTRY_LOCK = threading.Lock()
+
+
+def registry() -> ToolRegistry:
+    """Returns the process-wide :class:`.ToolRegistry`, instantiated on first use"""
+
+    global REGISTRY
+
+    with REGISTRY_LOCK:
+        if REGISTRY is None:
+            REGISTRY = ToolRegistry(ToolRegistry.default_path())
+
+    return REGISTRY
 
 
 class Tool(object):
@@ -51,65 +255,210 @@ class Tool(object):
     Wrapper-class for invoking system tools
     """
 
+    CONCURRENCY = threading.BoundedSemaphore(os.cpu_count() or 1)  # See execute()
+    LOGGING = threading.Lock()  # Serializes writes to logfiles
+
     def __init__(self, executable, cwd):
         self.executable = executable
         self.cwd = cwd
 
-    def run(self, args: typing.List[str]):
+    def execute(self, args: typing.List[str]):
         """
-        Invoke subprocess.run([self.executable] + args, ...); logging stdout
-        and stderr to the given 'logfile' using arguments and self.cwd as
-        cwd.
-
-        On success, proc is returned.
+        Invoke subprocess.run([self.executable] + args, ...) using self.cwd as
+        cwd, capturing stdout and stderr. At most :attr:`.Tool.CONCURRENCY`
+        invocations, of any tool, execute at the same time.
         """
 
-        logpath = (Path(self.cwd) / f"{self.executable}.log").resolve()
-        cmd = [self.executable] + args
-
-        with logpath.open("a") as logfile:
-            logfile.write(f"# cmd({' '.join(cmd)})\n")
-            logfile.write(f"# cwd({self.cwd})\n")
-            logfile.flush()
-
-            proc = run(
-                cmd,
-                stdout=logfile,
+        with Tool.CONCURRENCY, trace.span(self.executable, "tool", args=args):
+            return run(
+                [self.executable] + args,
+                stdout=PIPE,
                 stderr=STDOUT,
                 check=False,
-                capture_output=False,
                 cwd=self.cwd,
             )
 
+    def log(self, args: typing.List[str], proc) -> int:
+        """
+        Write the command-line and output of 'proc' to the logfile of the tool,
+        as one block, and log an error on non-zero return-code. Returns the
+        return-code.
+        """
+
+        logpath = (Path(self.cwd) / f"{self.executable}.log").resolve()
+        cmd = [self.executable] + args
+
+        with Tool.LOGGING:
+            with logpath.open("a") as logfile:
+                logfile.write(f"# cmd({' '.join(cmd)})\n")
+                logfile.write(f"# cwd({self.cwd})\n")
+                logfile.write(proc.stdout.decode(errors="replace"))
+
         rcode = proc.returncode
         if rcode:
             log.error(
                 f"cmd({' '.join(cmd)}) exited with rcode({rcode}),"
-                f" see logfile({logfile.name}) for details"
+                f" see logfile({logpath}) for details"
             )
 
-        return rcode, proc
+        return rcode
+
+    def run(self, args: typing.List[str]):
+        """
+        Invoke the tool with the given 'args', see :meth:`.Tool.execute`, and
+        log the command-line, stdout and stderr to the logfile of the tool in
+        self.cwd, see :meth:`.Tool.log`.
+
+        Returns the return-code and proc.
+        """
+
+        proc = self.execute(args)
+
+        return self.log(args, proc), proc
+
+    @staticmethod
+    def set_concurrency(limit: int):
+        """Set the limit of tool-invocations executing at the same time"""
+
+        Tool.CONCURRENCY = threading.BoundedSemaphore(max(1, limit))
 
     def exists(self):
-        """Returns true if the tool exists."""
+        """
+        Returns true if the tool exists, that is, the executable is found in
+        PATH and invoking it with '--version' succeeds. The result is cached,
+        see :class:`.ToolRegistry`.
+        """
 
-        try:
-            rcode, _ = self.run(["--version"])
-            return rcode == 0
-        except FileNotFoundError:
+        probe = registry().probe(self.executable, self.cwd)
+        if probe is None:
             log.error("executable(%s); FileNotFound", self.executable)
+            return False
+
+        return probe["rcode"] == 0
+
+    def version(self) -> str:
+        """
+        Returns the output of invoking the tool with '--version', or the empty
+        string when the tool does not exist. The output is cached, see
+        :class:`.ToolRegistry`.
+        """
+
+        probe = registry().probe(self.executable, self.cwd)
+
+        return probe["version"] if probe else ""
+
+
+def run_concurrently(
+    chains: typing.List[typing.List[typing.Tuple[Tool, typing.List[str]]]],
+) -> typing.List[int]:
+    """
+    Run the given 'chains' of tool-invocations concurrently, that is, the
+    invocations within a chain are run one after the other, as they usually
+    depend on each other, e.g. formatting a file and then checking it, whereas
+    the chains are independent and run at the same time. The number of tools
+    executing at the same time is capped by :attr:`.Tool.CONCURRENCY`.
+
+    The output of each invocation is logged, see :meth:`.Tool.log`, in the
+    order of the chains and invocations given, regardless of the order in which
+    they finish. Returns the first non-zero return-code of each chain, or zero.
+    """
+
+    def execute(chain):
+        return [tool.execute(args) for tool, args in chain]
 
-        return False
+    rcodes = []
+    with ThreadPoolExecutor(max_workers=max(1, len(chains))) as executor:
+        futures = [executor.submit(execute, chain) for chain in chains]
+        for chain, future in zip(chains, futures):
+            procs = future.result()
+            rcode = 0
+            for (tool, args), proc in zip(chain, procs):
+                logged = tool.log(args, proc)
+                rcode = rcode or logged
+            rcodes.append(rcode)
+
+    return rcodes
 
 
 class Black(Tool):
     """
     Wrapper for the system-tool ``black``, usually utilized to format code
-    emitted by Python-targets
+    emitted by Python-targets. When the ``black`` library is importable, then
+    code can be formatted in-process, see :meth:`.Black.format_str`.
     """
 
     def __init__(self, cwd):
         super().__init__("black", cwd)
+        self.mode = None  # The black.Mode of the configuration, see config_mode()
+
+    def config(self) -> typing.Optional[str]:
+        """
+        Returns the path to the configuration, that is, the ``pyproject.toml``
+        discovered from self.cwd, as is done by the executable, or None when
+        there is no configuration or the library is not available
+        """
+
+        black = import_optional("black")
+        if black is None:
+            return None
+
+        return black.find_pyproject_toml((str(self.cwd),))
+
+    def format_str(self, source: str) -> typing.Optional[str]:
+        """
+        Returns 'source' formatted by the ``black`` library, using the
+        configuration given by :meth:`.Black.config`. Returns None when the
+        library is not available, or fails, such that the executable is used.
+        """
+
+        black = import_optional("black")
+        if black is None:
+            return None
+
+        try:
+            if self.mode is None:
+                self.mode = self.config_mode(black)
+
+            with trace.span("black", "format"):
+                return black.format_str(source, mode=self.mode)
+        except Exception as exc:  # E.g. InvalidInput, or options of older black
+            log.error("black: failed formatting in-process(%s)", exc)
+
+        return None
+
+    def config_mode(self, black) -> typing.Any:
+        """
+        Returns the black.Mode of the configuration, see :meth:`.Black.config`.
+        Only the options which are configured are given, such that the defaults
+        of the installed version of black apply to the rest.
+        """
+
+        path = self.config()
+        config = black.parse_pyproject_toml(path) if path else {}
+
+        options = {
+            "target_versions": {
+                black.TargetVersion[version.upper()]
+                for version in config.get("target_version", [])
+            },
+            "line_length": config.get("line_length", black.DEFAULT_LINE_LENGTH),
+        }
+        for option, key in [
+            ("is_pyi", "pyi"),
+            ("skip_source_first_line", "skip_source_first_line"),
+            ("preview", "preview"),
+            ("unstable", "unstable"),
+        ]:
+            if key in config:
+                options[option] = config[key]
+        for option, key in [
+            ("string_normalization", "skip_string_normalization"),
+            ("magic_trailing_comma", "skip_magic_trailing_comma"),
+        ]:
+            if key in config:
+                options[option] = not config[key]
+
+        return black.Mode(**options)
 
 
 class ClangFormat(Tool):
@@ -124,6 +473,38 @@ class ClangFormat(Tool):
     def __init__(self, cwd):
         super().__init__(ClangFormat.CLANGFORMAT_BIN, cwd)
 
+    def format_str(
+        self, source: str, style: str, filename: str
+    ) -> typing.Optional[str]:
+        """
+        Returns 'source' formatted using the 'style' file, in self.cwd, as
+        though it was the content of 'filename'. The source is given via stdin,
+        returns None when the tool does not exist or fails.
+        """
+
+        path = registry().which(self.executable)
+        if path is None:
+            return None
+
+        args = [f"--style=file:{style}", f"--assume-filename={filename}"]
+        with Tool.CONCURRENCY, trace.span(self.executable, "tool", args=args):
+            proc = run(
+                [path] + args,
+                input=source.encode(),
+                stdout=PIPE,
+                stderr=PIPE,
+                check=False,
+                cwd=self.cwd,
+            )
+        if proc.returncode:
+            log.error(
+                f"cmd({self.executable} {' '.join(args)}) exited with"
+                f" rcode({proc.returncode}): {proc.stderr.decode().strip()}"
+            )
+            return None
+
+        return proc.stdout.decode()
+
 
 class Doxygen(Tool):
     """
@@ -150,12 +531,105 @@ class Gcc(Tool):
 
 class Isort(Tool):
     """
-    Wrapper for ``isort``
+    Wrapper for ``isort``. When the ``isort`` library is importable, then code
+    can be formatted in-process, see :meth:`.Isort.format_str`.
     """
 
     def __init__(self, cwd):
         super().__init__("isort", cwd)
 
+    def format_str(self, source: str) -> typing.Optional[str]:
+        """
+        Returns 'source' formatted by the ``isort`` library, or None when the
+        library is not available. The configuration is discovered from
+        self.cwd, as is done by the executable.
+        """
+
+        isort = import_optional("isort")
+        if isort is None:
+            return None
+
+        with trace.span("isort", "format"):
+            return isort.code(source, config=isort.Config(settings_path=str(self.cwd)))
+
+
+class PkgConfig(Tool):
+    """
+    Wrapper for ``pkg-config``
+
+    The flags are cached, see :class:`.ToolRegistry`, invalidated by changes to
+    the ``pkg-config`` executable and the ``.pc`` files of the package and of
+    the packages it requires, and keyed by the environment variables in
+    :attr:`.PkgConfig.ENVIRONMENT`.
+    """
+
+    ENVIRONMENT = [  # Environment variables affecting the output of pkg-config
+        "PKG_CONFIG_PATH",
+        "PKG_CONFIG_LIBDIR",
+        "PKG_CONFIG_SYSROOT_DIR",
+        "PKG_CONFIG_ALLOW_SYSTEM_CFLAGS",
+        "PKG_CONFIG_ALLOW_SYSTEM_LIBS",
+    ]
+
+    def __init__(self, cwd):
+        super().__init__("pkg-config", cwd)
+
+    def flags(self, pkg: str, kind: str) -> typing.List[str]:
+        """Returns the flags of the given 'kind', e.g. 'cflags', for 'pkg'"""
+
+        path = registry().which(self.executable)
+        if path is None:
+            raise ToolError(f"executable({self.executable}); FileNotFound")
+
+        def query(arg: str, name: str) -> str:
+            proc = run([path, arg, name], stdout=PIPE, stderr=PIPE, check=False)
+            if proc.returncode:
+                raise ToolError(
+                    f"cmd({self.executable} {arg} {name}) exited with"
+                    f" rcode({proc.returncode}): {proc.stderr.decode().strip()}"
+                )
+
+            return proc.stdout.decode().strip()
+
+        def compute():
+            flags = query(f"--{kind}", pkg).split()
+
+            # The .pc files of the package, and of the packages it requires
+            pcfiles = []
+            pending, seen = [pkg], set()
+            while pending:
+                name = pending.pop()
+                if name in seen:
+                    continue
+                seen.add(name)
+
+                pcfiledir = query("--variable=pcfiledir", name)
+                pcfiles.append(str(Path(pcfiledir) / f"{name}.pc"))
+                for arg in ["--print-requires", "--print-requires-private"]:
+                    pending += [
+                        line.split()[0]
+                        for line in query(arg, name).splitlines()
+                        if line.strip()
+                    ]
+
+            return flags, pcfiles
+
+        env = ":".join(os.environ.get(var, "") for var in PkgConfig.ENVIRONMENT)
+
+        return registry().cached(
+            f"pkg-config:{path}:{env}:{kind}:{pkg}", [path], compute
+        )
+
+    def cflags(self, pkg: str) -> typing.List[str]:
+        """Returns the output of 'pkg-config --cflags {pkg}' as a list"""
+
+        return self.flags(pkg, "cflags")
+
+    def libs(self, pkg: str) -> typing.List[str]:
+        """Returns the output of 'pkg-config --libs {pkg}' as a list"""
+
+        return self.flags(pkg, "libs")
+
 
 class Python3(Tool):
     """
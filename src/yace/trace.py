@@ -0,0 +1,144 @@
+"""
+Tracing of where **yace** spends time and memory. When enabled, via
+:func:`.start`, then spans of work, such as compiler stages, template renders,
+and tool invocations, are recorded with:
+
+* wall-clock time
+* CPU time, of the thread doing the work
+* the peak of memory allocated by Python, via :mod:`tracemalloc`, during the span
+
+On :func:`.stop`, the spans are exported as Chrome trace-event JSON, which can
+be loaded by e.g. ``chrome://tracing`` or https://ui.perfetto.dev. When tracing
+is not enabled, then :func:`.span` does nothing.
+
+Tracing memory slows down Python considerably, thus, when measuring time, then
+tracing is enabled without memory, e.g. ``start(memory=False)``, and memory is
+measured in a separate run.
+
+Memory is traced for the process as a whole, thus, the peak of a span includes
+allocations made by other threads during the span, e.g. by targets processed
+concurrently.
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional
+
+TRACER: Optional["Tracer"] = None  # The tracer in use, see start()
+
+
+class Tracer(object):
+    """Records spans as Chrome trace-events"""
+
+    def __init__(self, memory: bool = True):
+        self.begin = time.perf_counter()
+        self.memory = memory  # Whether peaks of memory are recorded
+        self.events: List[dict] = []
+        self.peaks: Dict[int, int] = {}  # Peak of memory, per active span
+        self.lock = threading.Lock()
+
+    def update_peaks(self):
+        """Attribute the peak of memory since the last update to active spans"""
+
+        _, peak = tracemalloc.get_traced_memory()
+        for ident in self.peaks:
+            self.peaks[ident] = max(self.peaks[ident], peak)
+        tracemalloc.reset_peak()
+
+    @contextlib.contextmanager
+    def span(self, name: str, cat: str, **args):
+        """Record the work done in the body of the with-statement as a span"""
+
+        ident = id(args)
+        if self.memory:
+            with self.lock:
+                self.update_peaks()
+                self.peaks[ident] = tracemalloc.get_traced_memory()[0]
+
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield args
+        finally:
+            cpu = time.thread_time() - cpu
+            end = time.perf_counter()
+
+            with self.lock:
+                args["wall_ms"] = round((end - wall) * 1000, 3)
+                args["cpu_ms"] = round(cpu * 1000, 3)
+                if self.memory:
+                    self.update_peaks()
+                    args["mem_peak_kb"] = round(self.peaks.pop(ident) / 1024, 1)
+
+                self.events.append(
+                    {
+                        "name": name,
+                        "cat": cat,
+                        "ph": "X",
+                        "ts": round((wall - self.begin) * 1e6, 1),
+                        "dur": round((end - wall) * 1e6, 1),
+                        "pid": os.getpid(),
+                        "tid": threading.get_ident(),
+                        "args": args,
+                    }
+                )
+
+    def to_file(self, path: Path):
+        """Write the recorded spans, in Chrome trace-event JSON, to 'path'"""
+
+        with self.lock:
+            events = sorted(self.events, key=lambda event: event["ts"])
+
+        path.write_text(
+            json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, indent=1)
+        )
+
+
+def start(memory: bool = True) -> Tracer:
+    """
+    Enable tracing, of memory when 'memory' is True, returns the
+    :class:`.Tracer` recording the spans
+    """
+
+    global TRACER
+
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    TRACER = Tracer(memory)
+
+    return TRACER
+
+
+def stop(path: Optional[Path] = None) -> Optional[Tracer]:
+    """Disable tracing, writing the spans recorded to 'path', when given"""
+
+    global TRACER
+
+    tracer, TRACER = TRACER, None
+    if tracer is None:
+        return None
+
+    if tracer.memory:
+        tracemalloc.stop()
+    if path is not None:
+        tracer.to_file(path)
+
+    return tracer
+
+
+def span(name: str, cat: str, **args):
+    """
+    Returns a context-manager recording a span named 'name', of the category
+    'cat', e.g. "stage" or "tool", with the given 'args'. Does nothing when
+    tracing is not enabled.
+    """
+
+    if TRACER is None:
+        return contextlib.nullcontext()
+
+    return TRACER.span(name, cat, **args)
@@ -12,11 +12,91 @@ lot simpler.
 
 Also, at the IR-level, then coding-conventions such as CamelCase can be
 shared by multiple targets.
+
+Multiple transformations are run by the :class:`.PassManager`, in as few walks
+of the model as possible.
 """
 
+import logging as log
+import time
+from typing import Dict, List, Optional
+
 from yace.emitters import camelcase
 from yace.ir.derivedtypes import Struct, Union
-from yace.model import ModelWalker
+from yace.model import Model, ModelWalker
+
+
+class PassManager(ModelWalker):
+    """
+    Runs the given transformations, the 'passes', in as few walks of the model
+    as possible. Consecutive passes with ``FUSABLE = True`` are run in a single
+    walk, visiting each entity with each of the passes, in the given order.
+    Passes with ``FUSABLE = False``, e.g. those re-structuring the model, are
+    run in a walk of their own.
+
+    A pass declares the keys of the entities it transforms via ``KEYS``, the
+    entities of other keys are not dispatched to it; ``KEYS = None`` means all
+    entities. The time spent in each pass is accumulated in ``self.timings``.
+    """
+
+    def __init__(self, model, passes: List[type]):
+        super().__init__(model)
+
+        self.passes = [cls(model) for cls in passes]
+        self.timings: Dict[str, float] = {type(p).__name__: 0.0 for p in self.passes}
+        self.table: Dict[str, List[ModelWalker]] = {}
+        self.group: List[ModelWalker] = []
+
+    def dispatch(self, key: str) -> List[ModelWalker]:
+        """Returns the passes, of the current group, to visit entities of 'key'"""
+
+        passes = self.table.get(key)
+        if passes is None:
+            passes = [p for p in self.group if p.KEYS is None or key in p.KEYS]
+            self.table[key] = passes
+
+        return passes
+
+    def groups(self) -> List[List[ModelWalker]]:
+        """Returns the passes grouped by the walks needed to run them"""
+
+        groups: List[List[ModelWalker]] = []
+        for cur in self.passes:
+            if groups and cur.FUSABLE and all(p.FUSABLE for p in groups[-1]):
+                groups[-1].append(cur)
+            else:
+                groups.append([cur])
+
+        return groups
+
+    def walk(self) -> bool:
+        """Runs the passes, returns False when a pass fails"""
+
+        for group in self.groups():
+            self.group = group
+            self.table = {
+                key: [p for p in group if p.KEYS is None or key in p.KEYS]
+                for key in Model.MAPPING
+            }
+            if not super().walk():
+                return False
+
+        for name, elapsed in self.timings.items():
+            log.info("Pass: %s, time: %.6fs", name, elapsed)
+
+        return True
+
+    def visit(self, current, ancestors, depth):
+        """Visit 'current' with each of the passes dispatched by its key"""
+
+        for cur in self.dispatch(current.key):
+            begin = time.perf_counter()
+            ok, message = cur.visit(current, ancestors, depth)
+            self.timings[type(cur).__name__] += time.perf_counter() - begin
+            if not ok:
+                return (False, f"{type(cur).__name__}: {message}")
+
+        return (True, None)
 
 
 class CStyle(ModelWalker):
@@ -31,10 +111,13 @@ class CStyle(ModelWalker):
     described above is not performed.
     """
 
+    KEYS: Optional[List[str]] = ["define", "enum_value"]
+    FUSABLE = True
+
     def visit(self, current, ancestors, depth):
         """..."""
 
-        if "sym" not in list(current.model_dump().keys()):
+        if not self.has_field(current, "sym"):
             return (True, None)
 
         if current.key in ["define"]:
@@ -66,8 +149,11 @@ class Camelizer(ModelWalker):
     described above is not performed.
     """
 
+    KEYS: Optional[List[str]] = ["define", "enum", "struct", "union", "enum_value"]
+    FUSABLE = True
+
     def visit(self, current, ancestors, depth):
-        if "sym" not in list(current.model_dump().keys()):
+        if not self.has_field(current, "sym"):
             return (True, None)
 
         if current.key in ["define"]:
@@ -87,6 +173,9 @@ class HoistAnonMembers(ModelWalker):
     to top-level declaration, leaving behind a replace of the entity with a
     field with a typespec matching the extracted entity"""
 
+    KEYS: Optional[List[str]] = ["struct_decl", "union_decl"]
+    FUSABLE = False
+
     def visit(self, current, ancestors, depth):
         if depth != 0:
             return (True, None)
@@ -95,3 +184,5 @@ class HoistAnonMembers(ModelWalker):
             return (True, None)
 
         # TODO: top-level struct or union
+
+        return (True, None)
@@ -1,7 +1,11 @@
 import tempfile
 from pathlib import Path
 
-from yace.ir.cparser import c_to_yace
+import pytest
+
+from yace.ir.base import Docstring
+from yace.ir.cparser import c_to_yace, get_fixed_width, literal_from_text, write_yace
+from yace.model import Model
 
 
 def test_do_format():
@@ -14,3 +18,151 @@ def test_do_format():
 
         entity_count, errors = c_to_yace([path], output_path)
         assert not errors, f"Failed parsing C Header at path: {path}: {errors}"
+
+
+def test_parallel_matches_serial():
+    """Parsing headers using worker-processes, yields the same Yace-files"""
+
+    paths = sorted(Path(__file__).parent.glob("*.h"))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        serial, parallel = Path(tmpdir) / "serial", Path(tmpdir) / "parallel"
+
+        serial_count, serial_errors = c_to_yace(paths, serial)
+        parallel_count, parallel_errors = c_to_yace(paths, parallel, jobs=2)
+
+        assert serial_count == parallel_count
+        assert [str(e) for e in serial_errors] == [str(e) for e in parallel_errors]
+        for path in paths:
+            name = path.with_suffix(".yaml").name
+            assert (serial / name).read_text() == (parallel / name).read_text()
+
+
+def test_pch_matches_plain(tmp_path):
+    """Parsing with a pre-compiled header of an included header, yields the same"""
+
+    (tmp_path / "base.h").write_text(
+        "#ifndef BASE_H\n#define BASE_H\n#include <stdint.h>\n"
+        "typedef uint32_t base_t;\n#endif\n"
+    )
+    path = tmp_path / "a.h"
+    path.write_text(
+        '#include "base.h"\n#define A_MAX 7\n'
+        "/**\n * A struct\n */\nstruct a_s {\n  uint8_t x; ///< X\n};\n"
+    )
+    plain, pch = tmp_path / "plain", tmp_path / "pch"
+
+    plain_count, plain_errors = c_to_yace([path], plain)
+    pch_count, pch_errors = c_to_yace([path], pch, pch=[str(tmp_path / "base.h")])
+
+    assert plain_count == pch_count == 3
+    assert [str(e) for e in plain_errors] == [str(e) for e in pch_errors]
+    assert (plain / "a.yaml").read_text() == (pch / "a.yaml").read_text()
+
+
+def test_fast_matches_plain():
+    """Parsing in fast-mode, yields the same Yace-file"""
+
+    path = Path(__file__).parent / "example.h"
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        plain, fast = Path(tmpdir) / "plain", Path(tmpdir) / "fast"
+
+        c_to_yace([path], plain)
+        c_to_yace([path], fast, fast=True)
+
+        name = path.with_suffix(".yaml").name
+        assert (plain / name).read_text() == (fast / name).read_text()
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_failed_header_keeps_others(tmp_path, jobs):
+    """A C Header failing to parse is reported, the other headers are written"""
+
+    path = Path(__file__).parent / "example.h"
+    missing = tmp_path / "missing.h"
+    output = tmp_path / "output"
+
+    entity_count, errors = c_to_yace([path, missing], output, jobs=jobs)
+
+    assert entity_count
+    assert [e for e in errors if str(missing) in e.message]
+    assert sorted(p.name for p in output.iterdir()) == [
+        "example.status",
+        "example.yaml",
+    ]
+
+
+def test_write_yace_failure_keeps_previous(tmp_path):
+    """A failure midway, leaves the previous Yace-file and no temporary file"""
+
+    path = tmp_path / "a.h"
+    assert write_yace(path, tmp_path, [{"cls": "define", "sym": "A"}]) == 1
+    previous = (tmp_path / "a.yaml").read_text()
+
+    def entities():
+        yield {"cls": "define", "sym": "B"}
+        raise RuntimeError("parse failure")
+
+    with pytest.raises(RuntimeError):
+        write_yace(path, tmp_path, entities())
+
+    assert (tmp_path / "a.yaml").read_text() == previous
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.yaml"]
+
+
+def test_get_fixed_width():
+    """Fixed-width integers are recognized by their exact spelling"""
+
+    assert get_fixed_width(["uint8_t", "foo"]).key == "u8_tspec"
+    assert get_fixed_width(["uint8_tx", "foo"]) is None
+    assert get_fixed_width(["int", "foo"]) is None
+
+
+def test_literal_from_text():
+    """Literals are recognized as hexadecimal, decimal, or string constants"""
+
+    for text, key, lit in [
+        ("0xACDC", "hex", 0xACDC),
+        ("42", "dec", 42),
+        ('"foo bar"', "str", "foo bar"),
+    ]:
+        literal = literal_from_text(text)
+        assert (literal.key, literal.lit) == (key, lit)
+    assert literal_from_text("foo") is None
+
+
+def test_docstring_from_raw_comment():
+    """The raw comment is split into brief, description, and tags"""
+
+    raw = "\n".join(
+        [
+            "/**",
+            " * Brief of foo",
+            " *",
+            " * Description of foo,",
+            " * spanning lines",
+            " *",
+            " * @param bar the bar",
+            " */",
+        ]
+    )
+    assert Docstring.from_raw_comment(raw) == {
+        "brief": "Brief of foo",
+        "description": "Description of foo, spanning lines",
+        "tags": {"param": {"bar": "the bar"}},
+    }
+    assert Docstring.from_raw_comment("///< Trailing").brief == "Trailing"
+    assert Docstring.from_raw_comment(None)["brief"] == ""
+
+
+def test_output_is_valid_model():
+    """The streamed Yace-file loads as a Model"""
+
+    path = Path(__file__).parent / "struct.h"
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        entity_count, _ = c_to_yace([path], Path(tmpdir))
+
+        model = Model.from_path(Path(tmpdir) / path.with_suffix(".yaml").name)
+        assert len(model.entities) == entity_count
@@ -0,0 +1,67 @@
+import subprocess
+import sys
+
+import pytest
+
+HEAVY = [
+    "clang",
+    "jinja2",
+    "pydantic",
+    "yace.compiler",
+    "yace.ir.cparser",
+    "yace.model",
+    "yace.targets.capi.target",
+    "yace.targets.ctypes.target",
+]
+
+
+def imported(code):
+    """Returns the names of the modules imported by running 'code'"""
+
+    proc = subprocess.run(
+        [sys.executable, "-c", f"{code}; import sys; print(' '.join(sys.modules))"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    return set(proc.stdout.split())
+
+
+def test_cli_import_is_lazy():
+    """Importing the command-line interface does not load the frontend nor targets"""
+
+    modules = imported("import yace.cli.yace")
+
+    assert not modules & set(HEAVY)
+
+
+def test_targets_load_only_selected():
+    """Loading a builtin target does not load the other builtin targets"""
+
+    modules = imported("import yace.targets; yace.targets.load(['ctypes'])")
+
+    assert "yace.targets.ctypes.target" in modules
+    assert "yace.targets.capi.target" not in modules
+    assert "clang" not in modules
+
+
+def test_cli_tool_jobs(tmp_path, monkeypatch):
+    """The limit of concurrent tool-invocations is given by '--tool-jobs'"""
+
+    from yace.cli import yace
+    from yace.tools import Tool
+
+    limits = []
+    monkeypatch.setattr(Tool, "set_concurrency", staticmethod(limits.append))
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["yace", "models/example.yaml", "--emit", "ctypes", "--no-cache"]
+        + ["--output", str(tmp_path), "--tool-jobs", "2"],
+    )
+
+    with pytest.raises(SystemExit):
+        yace.main()
+
+    assert limits == [2]
@@ -3,7 +3,12 @@ from pathlib import Path
 
 import pytest
 
+from yace.cache import BuildCache
 from yace.compiler import Compiler
+from yace.model import Model
+from yace.targets import available
+from yace.targets.capi.target import CAPI
+from yace.targets.ctypes.target import Ctypes
 
 MODELS = Path("models")
 
@@ -12,7 +17,7 @@ VALID = [p for p in sorted(MODELS.glob("*.yaml")) if "invalid" not in p.name]
 INVALID = [p for p in sorted(MODELS.glob("*invalid*.yaml"))]
 
 
-@pytest.mark.parametrize("path,target", product(VALID, Compiler.TARGETS))
+@pytest.mark.parametrize("path,target", product(VALID, available()))
 def test_compiler_with_valid_model(path, target):
     """Test **yace** via the cli using valid **yims**"""
 
@@ -20,9 +25,138 @@ def test_compiler_with_valid_model(path, target):
     yace.process(path)
 
 
-@pytest.mark.parametrize("path,target", product(INVALID, Compiler.TARGETS))
+@pytest.mark.parametrize("path,target", product(INVALID, available()))
 def test_compiler_with_invalid_model(path, target):
     """Test **yace** via the cli using invalid **yims**"""
 
     yace = Compiler([target.NAME], Path("/tmp") / "foo")
     yace.process(path)
+
+
+@pytest.mark.parametrize("path", VALID)
+def test_compiler_with_multiple_jobs(path):
+    """Test **yace** processing all targets concurrently"""
+
+    yace = Compiler([t.NAME for t in available()], Path("/tmp") / "foo", jobs=2)
+    yace.process(path)
+
+
+def test_compiler_batch(tmp_path):
+    """Test **yace** processing multiple Yace-files concurrently"""
+
+    paths = [tmp_path / f"{name}.yaml" for name in ["a", "b", "c"]]
+    for path in paths:
+        path.write_text(VALID[0].read_text())
+
+    yace = Compiler(["ctypes"], tmp_path / "output", jobs=3)
+    if not yace.is_ready(Ctypes(tmp_path / "output")):
+        pytest.skip("Tools of the ctypes target are not available")
+
+    results = yace.process_batch(paths)
+    assert results == {path: True for path in paths}
+    for path in paths:
+        assert BuildCache(
+            Ctypes(tmp_path / "output"), path, Compiler.STAGES
+        ).stamp.exists()
+
+
+def test_compiler_cache(tmp_path):
+    """Processing an unchanged Yace-file a second time, leaves the target up-to-date"""
+
+    path = VALID[0]
+
+    yace = Compiler(["ctypes"], tmp_path)
+    if not yace.process(path):
+        pytest.skip("Tools of the ctypes target are not available")
+
+    cache = BuildCache(Ctypes(tmp_path), path, Compiler.STAGES)
+    assert cache.is_up_to_date()
+    assert yace.process(path)
+
+
+def test_capi_check_objects_cached(tmp_path):
+    """Checking unchanged code, re-uses the objects and runs the check-program"""
+
+    model = Model.from_path(VALID[0])
+    model.entities = [e for e in model.entities if e.key != "function_decl"]
+
+    target = CAPI(tmp_path)
+    target.output.mkdir(parents=True, exist_ok=True)
+    target.transform(model)
+    target.emit(model)
+    target.flush()
+    if not target.tools["gcc"].exists():
+        pytest.skip("The compiler of the capi target is not available")
+
+    assert target.check(model) == 0
+    objects = sorted((target.output / BuildCache.DIRNAME / "objects").glob("*.o"))
+    assert len(objects) == len(target.sources)
+    mtimes = [obj.stat().st_mtime_ns for obj in objects]
+
+    assert target.check(model) == 0
+    assert [obj.stat().st_mtime_ns for obj in objects] == mtimes
+    assert (target.output / f"{model.meta.prefix}_check").exists()
+
+
+def test_capi_check_functions_without_pkg(tmp_path):
+    """Functions without a library to link with, are only compiled"""
+
+    model = Model.from_path(VALID[0])
+    assert not model.meta.pkg
+
+    target = CAPI(tmp_path)
+    target.transform(model)
+    target.emit(model)
+    target.flush()
+    if not target.tools["gcc"].exists():
+        pytest.skip("The compiler of the capi target is not available")
+
+    assert target.check(model) == 0
+    assert list((target.output / BuildCache.DIRNAME / "objects").glob("*.o"))
+    assert not (target.output / f"{model.meta.prefix}_check").exists()
+
+
+def test_target_output_unchanged(tmp_path):
+    """Emitting an unchanged model, leaves the files, and their mtime, as-is"""
+
+    def run():
+        target = Ctypes(tmp_path)
+        target.emit(target.transform(Model.from_path(VALID[0])))
+        target.flush()
+
+        return target
+
+    target = run()
+    mtimes = {path: path.stat().st_mtime_ns for path in target.sources}
+    (target.output / "ctypes_sugar.py").write_text("# modified\n")
+
+    target = run()
+    assert [p.name for p in target.sources if p.stat().st_mtime_ns != mtimes[p]] == [
+        "ctypes_sugar.py"
+    ]
+    assert (target.output / "ctypes_sugar.py").read_text() != "# modified\n"
+
+
+def test_target_output_reformatted(tmp_path, monkeypatch):
+    """Unchanged content is formatted again when the formatter changes"""
+
+    def run():
+        target = Ctypes(tmp_path)
+        target.emit(target.transform(Model.from_path(VALID[0])))
+        target.flush(formatting=True)
+
+        return target
+
+    monkeypatch.setattr(Ctypes, "format_str", lambda self, path, content: content)
+    monkeypatch.setattr(Ctypes, "formatter", lambda self: "plain")
+    run()
+
+    monkeypatch.setattr(
+        Ctypes, "format_str", lambda self, path, content: "# styled\n" + content
+    )
+    target = run()
+    assert not (target.output / "ctypes_sugar.py").read_text().startswith("# styled")
+
+    monkeypatch.setattr(Ctypes, "formatter", lambda self: "styled")
+    target = run()
+    assert (target.output / "ctypes_sugar.py").read_text().startswith("# styled\n")
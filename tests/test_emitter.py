@@ -1,6 +1,8 @@
+from pathlib import Path
+
 import pytest
 
-from yace.emitters import camelcase
+from yace.emitters import Emitter, camelcase
 
 SNAKECASE = ["foo", "foo_bar", "foo_bar_baz"]
 PASCALCASE = ["Foo", "FooBar", "FooBarBaz"]
@@ -15,3 +17,14 @@ def test_camelize_pascalcase(symbol, expected):
 @pytest.mark.parametrize("symbol,expected", zip(SNAKECASE, CAMELCASE))
 def test_camelize_camelcase(symbol, expected):
     assert camelcase(symbol, False) == expected
+
+
+def test_emitter_environment_is_cached():
+    """Emitters sharing a searchpath share the jinja-environment"""
+
+    searchpath = Path(__file__).parent.parent / "src" / "yace" / "targets" / "ctypes"
+
+    first = Emitter(searchpath).environment({})
+    second = Emitter(searchpath).environment({})
+
+    assert first is second
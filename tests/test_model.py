@@ -0,0 +1,109 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from yace.errors import InvalidModelData
+from yace.model import Model, ModelWalker
+
+MODELS = Path("models")
+
+
+def test_model_stream_roundtrip():
+    """A Model written to, and loaded from, a stream is unchanged"""
+
+    model = Model.from_path(MODELS / "example.yaml")
+
+    stream = io.StringIO()
+    model.to_file(stream)
+    stream.seek(0)
+
+    assert Model.from_path(stream) == model
+
+
+def test_model_from_path_cached(tmp_path):
+    """The Model loaded via the snapshot equals the Model loaded from YAML"""
+
+    path = MODELS / "example.yaml"
+
+    first = Model.from_path_cached(path, tmp_path)
+    assert list(tmp_path.glob("*.json"))
+
+    second = Model.from_path_cached(path, tmp_path)
+    assert first == second == Model.from_path(path)
+    assert first.model_dump(exclude_unset=True) == second.model_dump(exclude_unset=True)
+
+
+def test_model_from_data_shorthands():
+    """Entity-data is validated by key with short-hands expanded"""
+
+    meta = Model.from_path(MODELS / "example.yaml").meta
+    doc = {"brief": "", "description": "", "tags": {}}
+    entities = [
+        {"key": "define", "sym": "FOO", "val": 42, "doc": doc},
+        {
+            "key": "struct_decl",
+            "sym": "foo",
+            "doc": doc,
+            "members": [
+                {"key": "field_decl", "sym": "a", "typ": "u32_tspec", "doc": doc},
+                {
+                    "key": "bitfield_decl",
+                    "sym": "b",
+                    "typ": "u8_tspec",
+                    "nbits": 3,
+                    "doc": doc,
+                },
+            ],
+        },
+    ]
+
+    model = Model.from_data(meta, entities)
+
+    define, struct = model.entities
+    assert define.val.key == "dec" and define.val.lit == 42
+    assert struct.members[0].typ.key == "u32_tspec"
+    assert struct.members[1].key == "bitfield_decl"
+    assert struct.members[1].nbits == 3
+
+
+class Failing(ModelWalker):
+    """Fails on the second visit"""
+
+    def __init__(self, model):
+        super().__init__(model)
+        self.count = 0
+
+    def visit(self, current, ancestors, depth):
+        self.count += 1
+        return (self.count < 2, "failed")
+
+
+def test_model_from_data_invalid():
+    """Invalid entity-data raises InvalidModelData"""
+
+    meta = Model.from_path(MODELS / "example.yaml").meta.model_dump()
+
+    with pytest.raises(InvalidModelData):
+        Model.from_data(meta, [{"key": "no_such_key", "sym": "foo"}])
+    with pytest.raises(InvalidModelData):
+        Model.from_data(meta, [{"key": "define", "sym": "FOO", "val": "no_tspec"}])
+
+
+def test_model_walker_stops_at_first_failure():
+    """The walk stops at the first visit which does not succeed"""
+
+    walker = Failing(Model.from_path(MODELS / "example.yaml"))
+
+    assert not walker.walk()
+    assert walker.count == 2
+
+
+def test_model_walker_has_field():
+    """Field-presence is determined by the schema of the entity"""
+
+    model = Model.from_path(MODELS / "example.yaml")
+
+    for entity in model.entities:
+        expected = "sym" in entity.model_dump()
+        assert ModelWalker.has_field(entity, "sym") == expected
@@ -1,6 +1,19 @@
+import os
+import time
 from pathlib import Path
 
-from yace.tools import Python3, Tool
+import pytest
+
+from yace import tools
+from yace.tools import (
+    Black,
+    Isort,
+    PkgConfig,
+    Python3,
+    Tool,
+    ToolRegistry,
+    run_concurrently,
+)
 
 
 class FooBarBaz(Tool):
@@ -24,3 +37,133 @@ def test_tool_invalid_usage():
     rcode, proc = python.run(["--foo"])
 
     assert rcode
+
+
+def test_tool_registry_cache(tmp_path, monkeypatch):
+    """Probes are cached on disk, and invalidated when the executable changes"""
+
+    bindir = tmp_path / "bin"
+    bindir.mkdir()
+    executable = bindir / "foo_bar_qux"
+    executable.write_text("#!/bin/sh\necho 'foo 1.0'\n")
+    executable.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bindir), prepend=os.pathsep)
+
+    registry = ToolRegistry(tmp_path / "tools.json")
+    assert registry.probe("foo_bar_qux", tmp_path)["version"] == "foo 1.0"
+    assert registry.path.exists()
+
+    executable.write_text("#!/bin/sh\necho 'foo 1.10'\n")
+    assert ToolRegistry(registry.path).probe("foo_bar_qux", tmp_path) == {
+        "rcode": 0,
+        "version": "foo 1.10",
+    }
+
+
+def test_tool_registry_symlink(tmp_path, monkeypatch):
+    """Executables are invoked as found in PATH, and stamped by their target"""
+
+    bindir = tmp_path / "bin"
+    bindir.mkdir()
+    for name in ["one", "two"]:
+        (tmp_path / name).write_text(f'#!/bin/sh\necho "$(basename $0) {name}"\n')
+        (tmp_path / name).chmod(0o755)
+    (bindir / "foo_bar_qux").symlink_to(tmp_path / "one")
+    monkeypatch.setenv("PATH", str(bindir), prepend=os.pathsep)
+
+    registry = ToolRegistry(tmp_path / "tools.json")
+    assert registry.which("foo_bar_qux") == str(bindir / "foo_bar_qux")
+    assert registry.probe("foo_bar_qux", tmp_path)["version"] == "foo_bar_qux one"
+
+    (tmp_path / "one").write_text("#!/bin/sh\necho 'changed target'\n")
+    assert ToolRegistry(registry.path).probe("foo_bar_qux", tmp_path) == {
+        "rcode": 0,
+        "version": "changed target",
+    }
+
+    (bindir / "foo_bar_qux").unlink()
+    (bindir / "foo_bar_qux").symlink_to(tmp_path / "two")
+    assert ToolRegistry(registry.path).probe("foo_bar_qux", tmp_path) == {
+        "rcode": 0,
+        "version": "foo_bar_qux two",
+    }
+
+
+def test_tool_pkgconfig_cache(tmp_path, monkeypatch):
+    """The flags given by pkg-config are cached, and follow the .pc file"""
+
+    pcfile = tmp_path / "foo.pc"
+    pcfile.write_text("Name: foo\nDescription: foo\nVersion: 1\nCflags: -DFOO=1\n")
+    monkeypatch.setenv("PKG_CONFIG_PATH", str(tmp_path))
+    monkeypatch.setattr(tools, "REGISTRY", ToolRegistry(tmp_path / "tools.json"))
+
+    pkgconfig = PkgConfig(tmp_path)
+    if not pkgconfig.exists():
+        pytest.skip("pkg-config is not available")
+
+    (tmp_path / "bar.pc").write_text(
+        "Name: bar\nDescription: bar\nVersion: 1\nRequires: foo\nCflags: -DBAR\n"
+    )
+
+    assert pkgconfig.cflags("foo") == ["-DFOO=1"]
+    assert pkgconfig.cflags("bar") == ["-DBAR", "-DFOO=1"]
+
+    pcfile.write_text("Name: foo\nDescription: foo\nVersion: 1\nCflags: -DFOO=22\n")
+    assert pkgconfig.cflags("foo") == ["-DFOO=22"]
+    assert pkgconfig.cflags("bar") == ["-DBAR", "-DFOO=22"]
+
+
+def test_tool_run_concurrently(tmp_path):
+    """Chains run concurrently, and are logged in the order given"""
+
+    python = Python3(tmp_path)
+    chains = [
+        [(python, ["-c", "import time; time.sleep(0.5); print('first')"])],
+        [
+            (python, ["-c", "print('second')"]),
+            (python, ["-c", "import sys; print('third'); sys.exit(3)"]),
+        ],
+    ]
+
+    begin = time.perf_counter()
+    assert run_concurrently(chains) == [0, 3]
+    assert time.perf_counter() - begin < 1.0
+
+    content = (tmp_path / "python3.log").read_text()
+    lines = [line for line in content.splitlines() if not line.startswith("#")]
+    assert lines == ["first", "second", "third"]
+
+
+def test_tool_format_str(tmp_path):
+    """Black and isort format in-process, when the libraries are available"""
+
+    pytest.importorskip("black")
+    pytest.importorskip("isort")
+
+    source = "import sys\nimport os\nx = { 'a':1 }\n"
+
+    formatted = Isort(tmp_path).format_str(Black(tmp_path).format_str(source))
+    assert formatted == 'import os\nimport sys\n\nx = {"a": 1}\n'
+
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "pyproject.toml").write_text(
+        "[tool.black]\nskip-string-normalization = true\n"
+    )
+    assert (
+        Black(project).format_str(source) == "import sys\nimport os\n\nx = {'a': 1}\n"
+    )
+    assert Black(tmp_path).format_str("x = (\n") is None
+
+
+def test_tool_format_str_fallback(tmp_path, monkeypatch):
+    """When black fails in-process, e.g. an older version, then None is returned"""
+
+    black = pytest.importorskip("black")
+
+    def mode(**options):
+        raise TypeError("__init__() got an unexpected keyword argument 'unstable'")
+
+    monkeypatch.setattr(black, "Mode", mode)
+
+    assert Black(tmp_path).format_str("x = 1\n") is None
@@ -0,0 +1,49 @@
+import json
+import tracemalloc
+from pathlib import Path
+
+from yace import trace
+from yace.compiler import Compiler
+
+
+def test_trace_disabled():
+    """Without tracing enabled, then spans record nothing"""
+
+    assert trace.TRACER is None
+    with trace.span("foo", "test"):
+        pass
+    assert trace.stop() is None
+
+
+def test_trace_compiler(tmp_path):
+    """Stages of the compiler are recorded, and exported as trace-events"""
+
+    trace.start()
+    try:
+        yace = Compiler(["ctypes"], tmp_path, cache=False)
+        yace.process(Path("models") / "example.yaml", ["parse", "transform", "emit"])
+    finally:
+        trace.stop(tmp_path / "trace.json")
+
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    names = {(event["cat"], event["name"]) for event in events}
+    assert {("stage", "parse"), ("target", "ctypes"), ("stage", "emit")} <= names
+    assert ("render", "file_api") in names
+
+    for event in events:
+        assert event["ph"] == "X" and event["dur"] >= 0
+        assert {"wall_ms", "cpu_ms", "mem_peak_kb"} <= set(event["args"])
+
+
+def test_trace_without_memory():
+    """Without tracing memory, then spans record time only"""
+
+    tracer = trace.start(memory=False)
+    try:
+        with trace.span("foo", "test"):
+            pass
+    finally:
+        trace.stop()
+
+    assert not tracemalloc.is_tracing()
+    assert set(tracer.events[0]["args"]) == {"wall_ms", "cpu_ms"}
@@ -0,0 +1,32 @@
+from pathlib import Path
+
+from yace.model import Model
+from yace.transformations import Camelizer, CStyle, HoistAnonMembers, PassManager
+
+MODELS = Path("models")
+
+
+def test_pass_manager_fuses_passes():
+    """Fused passes produce the same model as walking each pass on its own"""
+
+    fused = Model.from_path(MODELS / "example.yaml")
+    manager = PassManager(fused, [CStyle, Camelizer])
+    assert len(manager.groups()) == 1
+    assert manager.walk()
+
+    walked = Model.from_path(MODELS / "example.yaml")
+    assert CStyle(walked).walk()
+    assert Camelizer(walked).walk()
+
+    assert fused == walked
+    assert set(manager.timings) == {"CStyle", "Camelizer"}
+
+
+def test_pass_manager_groups_unfusable_passes():
+    """A pass which is not fusable, is run in a walk of its own"""
+
+    model = Model.from_path(MODELS / "example.yaml")
+    manager = PassManager(model, [CStyle, HoistAnonMembers, Camelizer])
+
+    assert [len(group) for group in manager.groups()] == [1, 1, 1]
+    assert manager.walk()